@@ -6,17 +6,39 @@ from bs4 import BeautifulSoup
 from streamlit_autorefresh import st_autorefresh
 import streamlit.components.v1 as components
 import time
+import math
 import random
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque, OrderedDict
 import pickle
+import json
+import hashlib
+import functools
+import bisect
+import itertools
+import logging
 import os
+import shutil
+import socket
+from contextlib import contextmanager
+try:
+    import fcntl  # Advisory file locks (POSIX only)
+except ImportError:
+    fcntl = None
 import numpy as np
+import pyarrow as pa
+import pyarrow.feather as pa_feather
+import pyarrow.parquet as pq
 import decimal
 import email.utils
 from datetime import datetime, timezone, timedelta
 import altair as alt
 import plotly.express as px
 
+PAGE_RUN_STARTED = time.perf_counter()  # Full runs only - fragment reruns skip module level
+logger = logging.getLogger(__name__)
+
 def format_price(price):
     """Custom formatter to handle micro-prices without scientific notation"""
     if price is None: return "$0.00"
@@ -81,76 +103,454 @@ def get_relative_time(date_str):
     except:
         return "Hari ini"
 
+# --- CACHE METRICS (hits, misses, compute latency, payload size, evictions per cache) ---
+class CacheMetrics:
+    """Process-wide counters for every cached function and cache file"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caches = {}
+        self._computed = {}  # name -> argument hashes computed before (to spot evictions)
+        self.started_at = time.time()
+    
+    def computed_before(self, name, key):
+        """Remember that `key` was computed for `name`; True if it had been already"""
+        with self._lock:
+            keys = self._computed.setdefault(name, set())
+            seen = key in keys
+            keys.add(key)
+            return seen
+    
+    def record(self, name, event, latency=None, size=None):
+        """event: 'hit' | 'miss' | 'eviction'. latency (s) / size (bytes) describe a miss's compute."""
+        with self._lock:
+            m = self._caches.setdefault(name, {
+                'hits': 0, 'misses': 0, 'evictions': 0,
+                'compute_seconds': 0.0, 'compute_max': 0.0, 'last_size': None, 'max_size': 0
+            })
+            if event == 'hit':
+                m['hits'] += 1
+            elif event == 'miss':
+                m['misses'] += 1
+            elif event == 'eviction':
+                m['evictions'] += 1
+            if latency is not None:
+                m['compute_seconds'] += latency
+                m['compute_max'] = max(m['compute_max'], latency)
+            if size is not None:
+                m['last_size'] = size
+                m['max_size'] = max(m['max_size'], size)
+    
+    def snapshot(self):
+        """DataFrame, one row per cache"""
+        with self._lock:
+            rows = [dict(m, cache=name) for name, m in sorted(self._caches.items())]
+        df = pd.DataFrame(rows, columns=['cache', 'hits', 'misses', 'evictions', 'compute_seconds',
+                                         'compute_max', 'last_size', 'max_size'])
+        lookups = df['hits'] + df['misses']
+        df['hit_rate'] = (df['hits'] / lookups.where(lookups > 0)).round(3)
+        df['compute_avg'] = (df['compute_seconds'] / df['misses'].where(df['misses'] > 0)).round(4)
+        return df
+    
+    def export_text(self):
+        """Prometheus-style text exposition of all counters"""
+        lines = [f"# mitulama cache metrics, pid {os.getpid()}, since {datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds')}"]
+        with self._lock:
+            items = sorted(self._caches.items())
+        for field in ('hits', 'misses', 'evictions', 'compute_seconds', 'compute_max', 'last_size', 'max_size'):
+            suffix = "_total" if field in ('hits', 'misses', 'evictions', 'compute_seconds') else ""
+            lines.append(f"# TYPE mitulama_cache_{field}{suffix} {'counter' if suffix else 'gauge'}")
+            for name, m in items:
+                if m[field] is not None:
+                    lines.append(f'mitulama_cache_{field}{suffix}{{cache="{name}"}} {m[field]}')
+        return "\n".join(lines) + "\n"
+
+@st.cache_resource
+def get_cache_metrics():
+    """One metrics registry per server process"""
+    return CacheMetrics()
+
+def payload_size(value):
+    try:
+        return len(pickle.dumps(value))
+    except Exception:
+        return None
+
+def observed_cache_data(name, **cache_kwargs):
+    """st.cache_data(**cache_kwargs) that reports to the metrics registry under `name`.
+    A call whose body does not run is a hit; recomputing arguments seen before counts as an eviction (TTL/clear)."""
+    def decorator(fn):
+        local = threading.local()
+        
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            local.computed = True
+            key = hashlib.md5(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+            if get_cache_metrics().computed_before(name, key):
+                get_cache_metrics().record(name, 'eviction')
+            start = time.time()
+            result = fn(*args, **kwargs)
+            get_cache_metrics().record(name, 'miss', time.time() - start, payload_size(result))
+            return result
+        
+        cached = st.cache_data(**cache_kwargs)(compute)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            local.computed = False
+            result = cached(*args, **kwargs)
+            if not local.computed:
+                get_cache_metrics().record(name, 'hit')
+            return result
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+# --- RERUN LATENCY (page regions are fragments; an interaction reruns only its own region) ---
+class RenderTimings:
+    """Wall-clock render time per page region, last `window` runs each.
+    'page' is a full script run; every other region is one (full or fragment-scoped) run of that fragment."""
+
+    def __init__(self, window=200):
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples = {}
+
+    def record(self, region, seconds):
+        with self._lock:
+            self._samples.setdefault(region, deque(maxlen=self._window)).append(seconds)
+
+    def snapshot(self):
+        """DataFrame, one row per region (milliseconds)"""
+        with self._lock:
+            items = [(region, np.array(samples) * 1000) for region, samples in sorted(self._samples.items())]
+        rows = [
+            {'region': region, 'runs': len(ms), 'last_ms': round(ms[-1], 1), 'p50_ms': round(float(np.median(ms)), 1),
+             'p95_ms': round(float(np.percentile(ms, 95)), 1), 'max_ms': round(ms.max(), 1)}
+            for region, ms in items
+        ]
+        return pd.DataFrame(rows, columns=['region', 'runs', 'last_ms', 'p50_ms', 'p95_ms', 'max_ms'])
+
+    def export_text(self):
+        """Prometheus-style p50 / p95 gauges"""
+        snap = self.snapshot()
+        lines = []
+        for field in ('p50_ms', 'p95_ms'):
+            lines.append(f"# TYPE mitulama_render_{field} gauge")
+            lines.extend(f'mitulama_render_{field}{{region="{row.region}"}} {getattr(row, field)}' for row in snap.itertuples())
+        return "\n".join(lines) + "\n"
+
+@st.cache_resource
+def get_render_timings():
+    """One render-time registry per server process"""
+    return RenderTimings()
+
+def timed_fragment(region, **fragment_kwargs):
+    """st.fragment(**fragment_kwargs) whose every run is timed under `region`"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                get_render_timings().record(region, time.perf_counter() - start)
+        return st.fragment(timed, **fragment_kwargs)
+    return decorator
+
+# --- SHARED CACHE FILES (safe across sessions and server processes) ---
+TIERED_CACHE_DIR = ".tiered_cache"  # Disk tier of TieredCache, one sub-directory per cache
+# Every write goes to a temp file and is renamed into place, so readers never see a torn file.
+# Writers hold an exclusive advisory lock (<file>.lock); readers a shared one.
+@contextmanager
+def cache_file_lock(path, exclusive=True):
+    """Advisory lock on `path`.lock (no-op where fcntl is unavailable)"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def atomic_write(path, write_fn, binary=True):
+    """Write via write_fn(file) into a temp file next to `path`, then atomically replace `path`"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb' if binary else 'w', encoding=None if binary else 'utf-8') as f:
+            write_fn(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+class TieredCache:
+    """Size-bounded LRU in memory, backed by a size-bounded disk tier shared by all processes.
+    Footprint is the pickled size of each value; keys must be tuples of plain values."""
+    
+    def __init__(self, name, max_bytes, disk_bytes):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.disk_bytes = disk_bytes
+        self.disk_dir = os.path.join(TIERED_CACHE_DIR, name)
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._disk_used = None  # Measured lazily on the first disk write
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _disk_path(self, key):
+        # <ticker>-<hash>.pkl so one ticker's entries can be dropped without reading the rest
+        prefix = "".join(c if c.isalnum() else "_" for c in str(key[0]))
+        return os.path.join(self.disk_dir, f"{prefix}-{hashlib.md5(repr(key).encode()).hexdigest()}.pkl")
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                get_cache_metrics().record(self.name, 'hit')
+                return entry[0]
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                data = f.read()
+            stored_key, value = pickle.loads(data)
+        except Exception:
+            stored_key = None
+        if stored_key == key:
+            with self._lock:
+                self.disk_hits += 1
+            get_cache_metrics().record(self.name, 'hit')
+            self._remember(key, value, len(data))
+            return value
+        with self._lock:
+            self.misses += 1
+        return default
+    
+    def put(self, key, value):
+        data = pickle.dumps((key, value))
+        self._remember(key, value, len(data))
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            atomic_write(self._disk_path(key), lambda f: f.write(data))
+            self._account_disk(len(data))
+        except Exception:
+            pass
+        return len(data)
+    
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            start = time.time()
+            value = compute()
+            size = self.put(key, value)
+            get_cache_metrics().record(self.name, 'miss', time.time() - start, size)
+        return value
+    
+    def _remember(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+                get_cache_metrics().record(self.name, 'eviction')
+    
+    def _account_disk(self, size):
+        if self._disk_used is None:
+            self._disk_used = sum(e.stat().st_size for e in os.scandir(self.disk_dir) if e.name.endswith('.pkl'))
+        else:
+            self._disk_used += size
+        if self._disk_used <= self.disk_bytes:
+            return
+        # Over budget: drop least recently written files down to 80%
+        files = sorted((e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(self.disk_dir) if e.name.endswith('.pkl'))
+        self._disk_used = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self._disk_used <= self.disk_bytes * 0.8:
+                break
+            try:
+                os.remove(path)
+                self._disk_used -= size
+            except OSError:
+                pass
+    
+    def clear(self, tickers=None):
+        """Drop every entry, or only those whose key starts with one of `tickers`"""
+        prefixes = None if tickers is None else {"".join(c if c.isalnum() else "_" for c in str(t)) + "-" for t in tickers}
+        with self._lock:
+            for key in [k for k in self._entries if tickers is None or k[0] in tickers]:
+                self._bytes -= self._entries.pop(key)[1]
+        if os.path.isdir(self.disk_dir):
+            for entry in os.scandir(self.disk_dir):
+                if prefixes is not None and not any(entry.name.startswith(p) for p in prefixes):
+                    continue
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        self._disk_used = None  # Re-measured on the next write
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes,
+                'disk_bytes': self._disk_used, 'hits': self.hits, 'disk_hits': self.disk_hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else None
+            }
+
 # Cache file for persistent scanner results
-CACHE_FILE = ".scanner_cache.pkl"
+# Columnar (Arrow IPC, memory-mappable) table + normalized news table + tiny JSON meta.
+# Each save is a new numbered snapshot (.scanner_cache.<n>.arrow); the meta names the current one
+# (and the previous, kept for readers still mapping it) and is replaced last, so a reader always
+# gets one complete, consistent version.
+# Liveness is the heartbeat file's mtime, so keeping the cache alive costs no table I/O.
+CACHE_FILE = ".scanner_cache.{}.arrow"
+CACHE_NEWS_FILE = ".scanner_news.{}.arrow"
+CACHE_META_FILE = ".scanner_cache.json"
+CACHE_HEARTBEAT_FILE = ".scanner_cache.heartbeat"
+CACHE_EXPIRY = 300  # 5-minute inactivity
 WATCHLIST_CACHE_FILE = ".watchlist_cache.pkl"
+EVENT_LOG_FILE = ".screener_events.jsonl"  # Append-only status transition log
+OHLCV_CACHE_FILE = ".ohlcv_cache.pkl"      # Daily Close/Volume matrices (date x ticker)
+EXCLUSION_INDEX_FILE = ".exclusion_index.json"  # Stablecoin / wrapped asset ids from CoinGecko categories
+NEWS_FIELDS = ['title', 'source', 'link', 'date']
 
-def load_cached_results():
-    """Load scanner results from cache file with 5-minute expiration"""
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'rb') as f:
-                data = pickle.load(f)
-                
-                # Check 5-minute inactivity (300 seconds)
-                if time.time() - data.get('last_heartbeat', 0) > 300:
-                    os.remove(CACHE_FILE)
-                    return None
-                    
-                return data
-        except:
-            return None
-    return None
+def _read_cache_meta():
+    try:
+        with open(CACHE_META_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_cached_meta():
+    """Cheap check of the scanner cache: meta dict (+ 'last_heartbeat') or None if missing/expired"""
+    try:
+        last_heartbeat = os.path.getmtime(CACHE_HEARTBEAT_FILE)
+    except OSError:
+        return None
+    meta = _read_cache_meta()
+    if meta is None:
+        return None
+    
+    # Check 5-minute inactivity (300 seconds)
+    if time.time() - last_heartbeat > CACHE_EXPIRY:
+        get_cache_metrics().record("scanner_file", 'eviction')
+        clear_cached_results()
+        return None
+    meta['last_heartbeat'] = last_heartbeat
+    return meta
+
+def load_cached_results(known_snapshot=None):
+    """Load scanner results from cache file with 5-minute expiration.
+    Returns None when the cache is missing/expired or still at `known_snapshot`."""
+    meta = load_cached_meta()
+    if meta is None:
+        get_cache_metrics().record("scanner_file", 'miss')
+        return None
+    if meta.get('snapshot') == known_snapshot:
+        return None
+    try:
+        with cache_file_lock(CACHE_META_FILE, exclusive=False):
+            meta = dict(_read_cache_meta() or {}, last_heartbeat=meta['last_heartbeat'])
+            results = pa_feather.read_table(CACHE_FILE.format(meta['snapshot']), memory_map=True).to_pandas()
+            news = pa_feather.read_table(CACHE_NEWS_FILE.format(meta['snapshot']), memory_map=True).to_pandas()
+    except Exception:
+        get_cache_metrics().record("scanner_file", 'miss')
+        return None
+    get_cache_metrics().record("scanner_file", 'hit', size=int(results.memory_usage().sum() + news.memory_usage().sum()))
+    
+    # Re-nest the normalized news rows into the 'News List' column the UI expects
+    news_lists = {t: g[NEWS_FIELDS].to_dict('records') for t, g in news.groupby('Ticker', sort=False)}
+    results['News List'] = [news_lists.get(t, []) for t in results['Ticker']]
+    return dict(meta, results=results)
 
 
-def save_cached_results(results, timestamp):
-    """Save scanner results to cache file with heartbeat"""
+def save_cached_results(results, timestamp, version=0, stats=None, events=None):
+    """Save scanner results as the next snapshot, logging `events` (numbered in place) under the same lock.
+    Returns the snapshot number (None on failure)."""
     try:
-        current_time = time.time()
-        with open(CACHE_FILE, 'wb') as f:
-            pickle.dump({
-                'results': results, 
-                'timestamp': timestamp,
-                'last_heartbeat': current_time
-            }, f)
+        news = pd.DataFrame(
+            [dict({f: n.get(f) for f in NEWS_FIELDS}, Ticker=t)
+             for t, news_list in zip(results['Ticker'], results['News List']) for n in (news_list or [])],
+            columns=['Ticker'] + NEWS_FIELDS
+        ).astype(str)
+        table = results.drop(columns=['News List']).reset_index(drop=True)
+        with cache_file_lock(CACHE_META_FILE):
+            # Monotonic across processes (numbered under the writer lock) and across clears (ms floor)
+            previous = _read_cache_meta() or {}
+            event_seq = append_screener_events(events)
+            snapshot = max((previous.get('snapshot') or 0) + 1, int(time.time() * 1000))
+            atomic_write(CACHE_FILE.format(snapshot), lambda f: pa_feather.write_feather(table, f, compression='uncompressed'))
+            atomic_write(CACHE_NEWS_FILE.format(snapshot), lambda f: pa_feather.write_feather(news, f, compression='uncompressed'))
+            meta = {'snapshot': snapshot, 'previous': previous.get('snapshot'), 'timestamp': timestamp,
+                    'version': version, 'stats': stats, 'saved_at': time.time(), 'event_seq': event_seq}
+            atomic_write(CACHE_META_FILE, lambda f: json.dump(meta, f), binary=False)
+            # Keep the previous snapshot for readers still mapping it; drop the one before
+            if previous.get('previous') is not None:
+                for path in (CACHE_FILE.format(previous['previous']), CACHE_NEWS_FILE.format(previous['previous'])):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        update_cache_heartbeat()
+        return snapshot
     except:
-        pass
+        return None
 
 def update_cache_heartbeat():
     """Update only the heartbeat timestamp to keep cache alive"""
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'rb') as f:
-                data = pickle.load(f)
-            data['last_heartbeat'] = time.time()
-            with open(CACHE_FILE, 'wb') as f:
-                pickle.dump(data, f)
-        except:
-            pass
+    try:
+        with open(CACHE_HEARTBEAT_FILE, 'a'):
+            os.utime(CACHE_HEARTBEAT_FILE, None)
+    except:
+        pass
 
 def clear_cached_results():
     """Clear cached scanner results"""
-    if os.path.exists(CACHE_FILE):
-        try:
-            os.remove(CACHE_FILE)
-        except:
-            pass
+    with cache_file_lock(CACHE_META_FILE):
+        meta = _read_cache_meta() or {}
+        paths = [CACHE_META_FILE, CACHE_HEARTBEAT_FILE]
+        for n in (meta.get('snapshot'), meta.get('previous')):
+            if n is not None:
+                paths += [CACHE_FILE.format(n), CACHE_NEWS_FILE.format(n)]
+        for path in paths:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
 
 def load_watchlist_cache():
     """Load watchlist from cache"""
     if os.path.exists(WATCHLIST_CACHE_FILE):
         try:
             with open(WATCHLIST_CACHE_FILE, 'rb') as f:
-                return pickle.load(f)
+                watchlist_data = pickle.load(f)
+            get_cache_metrics().record("watchlist_file", 'hit', size=os.path.getsize(WATCHLIST_CACHE_FILE))
+            return watchlist_data
         except:
-            return None
+            pass
+    get_cache_metrics().record("watchlist_file", 'miss')
     return None
 
 def save_watchlist_cache(watchlist_data):
     """Save watchlist to cache"""
     try:
-        with open(WATCHLIST_CACHE_FILE, 'wb') as f:
-            pickle.dump(watchlist_data, f)
+        with cache_file_lock(WATCHLIST_CACHE_FILE):
+            atomic_write(WATCHLIST_CACHE_FILE, lambda f: pickle.dump(watchlist_data, f))
     except:
         pass
 
@@ -162,59 +562,235 @@ def clear_watchlist_cache():
         except:
             pass
 
+def _last_logged_seq():
+    """seq of the newest logged event (0 for an empty log)"""
+    try:
+        with open(EVENT_LOG_FILE, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 4096))
+            for line in reversed(f.read().splitlines()):
+                try:
+                    return json.loads(line)['seq']
+                except (ValueError, KeyError):
+                    continue  # Torn or cut-off line
+    except OSError:
+        return 0
+    last = load_screener_events(limit=1)
+    return last[-1]['seq'] if last else 0
+
+def append_screener_events(events):
+    """Number events after the last logged seq and append them to the log (one JSON object per line).
+    Callers hold cache_file_lock(CACHE_META_FILE), so seqs stay monotonic across processes.
+    Returns the logged [first, last] seq range, or None."""
+    if not events: return None
+    try:
+        seq = _last_logged_seq()
+        with open(EVENT_LOG_FILE, 'a', encoding='utf-8') as f:
+            for event in events:
+                seq += 1
+                event['seq'] = seq
+                f.write(json.dumps(event) + "\n")
+        return [events[0]['seq'], seq]
+    except:
+        return None
+
+def load_screener_events(since_seq=0, limit=None):
+    """Read events with seq > since_seq (oldest first). limit keeps only the newest N."""
+    events = []
+    if os.path.exists(EVENT_LOG_FILE):
+        try:
+            with open(EVENT_LOG_FILE, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Skip a torn trailing line
+                    if event.get('seq', 0) > since_seq:
+                        events.append(event)
+        except:
+            return []
+    return events[-limit:] if limit else events
+
+# --- SEARCH INDEX (prefix + typo-tolerant matching, built once per snapshot) ---
+class SearchIndex:
+    """Word-level index over weighted text fields of a list of documents.
+    A query word matches indexed words exactly, by prefix (sorted words + bisect), as a substring
+    (trigram containment) or fuzzily (trigram similarity), so typos like "etherium" still hit.
+    Every query word must match; documents rank by summed match quality x field weight,
+    ties keep document order (market cap rank)."""
+    
+    FUZZY_MIN = 0.45  # Trigram (Dice) similarity for a fuzzy match
+    QUERY_CACHE = 256
+    
+    def __init__(self, docs, fields):
+        """docs: list of (doc_id, {field: text}); fields: {field: weight}"""
+        self.doc_ids = [doc_id for doc_id, _ in docs]
+        self.postings = {}  # word -> {doc index: best field weight}
+        for i, (_, texts) in enumerate(docs):
+            for field, weight in fields.items():
+                for word in self.tokenize(texts.get(field)):
+                    posting = self.postings.setdefault(word, {})
+                    if weight > posting.get(i, 0):
+                        posting[i] = weight
+        self.words = sorted(self.postings)
+        self.grams = {}  # trigram -> words containing it
+        for word in self.words:
+            for gram in self._trigrams(word):
+                self.grams.setdefault(gram, set()).add(word)
+        self._queries = OrderedDict()
+    
+    @staticmethod
+    def tokenize(text):
+        if not text: return []
+        return [w for w in "".join(c if c.isalnum() else " " for c in str(text).lower()).split() if w]
+    
+    @staticmethod
+    def _trigrams(word, pad=True):
+        w = f"  {word} " if pad else word
+        return {w[i:i + 3] for i in range(len(w) - 2)}
+    
+    def _match_word(self, q):
+        """{indexed word: match quality} for one query word"""
+        matches = {}
+        if q in self.postings:
+            matches[q] = 1.0
+        lo = bisect.bisect_left(self.words, q)
+        for word in itertools.islice(self.words, lo, None):
+            if not word.startswith(q):
+                break
+            matches.setdefault(word, 0.8 + 0.15 * len(q) / len(word))
+        if len(q) < 3:
+            return matches
+        # Substring: words containing every (unpadded) trigram of q, verified
+        inner = self._trigrams(q, pad=False)
+        candidates = set.intersection(*(self.grams.get(g, set()) for g in inner))
+        for word in candidates:
+            if word not in matches and q in word:
+                matches[word] = 0.6
+        # Fuzzy: Dice similarity of padded trigrams
+        q_grams = self._trigrams(q)
+        overlap = {}
+        for g in q_grams:
+            for word in self.grams.get(g, ()):
+                overlap[word] = overlap.get(word, 0) + 1
+        for word, shared in overlap.items():
+            if word in matches:
+                continue
+            similarity = 2 * shared / (len(q_grams) + len(word) + 1)  # len(word)+1 padded trigrams
+            if similarity >= self.FUZZY_MIN:
+                matches[word] = 0.5 * similarity
+            elif self._one_edit(q, word):
+                # Short words share too few trigrams to survive one typo ("hodl" vs "hold")
+                matches[word] = 0.3
+        return matches
+    
+    @staticmethod
+    def _one_edit(a, b):
+        """True if a and b differ by one insert, delete, substitution or adjacent swap"""
+        if abs(len(a) - len(b)) > 1 or a == b:
+            return False
+        i = 0
+        while i < min(len(a), len(b)) and a[i] == b[i]:
+            i += 1
+        if len(a) == len(b):
+            return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1])
+        return a[i:] == b[i + 1:] if len(a) < len(b) else a[i + 1:] == b[i:]
+    
+    def search(self, query, limit=None):
+        """Ranked doc_ids matching every word of `query`"""
+        terms = self.tokenize(query)
+        if not terms: return []
+        key = (tuple(terms), limit)
+        if key in self._queries:
+            self._queries.move_to_end(key)
+            return self._queries[key]
+        scores = None
+        for q in terms:
+            term_scores = {}
+            for word, quality in self._match_word(q).items():
+                for i, weight in self.postings[word].items():
+                    score = quality * weight
+                    if score > term_scores.get(i, 0):
+                        term_scores[i] = score
+            scores = term_scores if scores is None else {i: scores[i] + sc for i, sc in term_scores.items() if i in scores}
+            if not scores: break
+        ranked = [self.doc_ids[i] for i in sorted(scores, key=lambda i: (-scores[i], i))]
+        result = ranked[:limit] if limit else ranked
+        self._queries[key] = result
+        if len(self._queries) > self.QUERY_CACHE:
+            self._queries.popitem(last=False)
+        return result
+
+@st.cache_resource(max_entries=4)
+def get_universe_search_index(universe_key, _coin_map):
+    """Symbol / name / CoinGecko id index of the universe; rebuilt only when universe_key changes"""
+    docs = [(sym, {'symbol': sym, 'name': coin.get('name'), 'id': coin.get('id')}) for sym, coin in _coin_map.items()]
+    return SearchIndex(docs, {'symbol': 1.0, 'name': 0.8, 'id': 0.6})
+
+@st.cache_resource(max_entries=4)
+def get_results_search_index(results_key, _df):
+    """Ticker / name / status / analysis index of one set of screener results"""
+    docs = [
+        (row['Ticker'], {'ticker': row['Ticker'], 'name': row.get('Name'), 'status': row.get('Status'), 'analysis': row.get('Analysis')})
+        for row in _df.to_dict('records')
+    ]
+    return SearchIndex(docs, {'ticker': 1.0, 'name': 0.8, 'status': 0.7, 'analysis': 0.4})
+
+# Simple Sector Inference (Same as diag script); a ticker listed twice belongs to its first sector
+SECTORS = {
+    'Layer 1': ['BTC', 'ETH', 'SOL', 'ADA', 'AVAX', 'DOT', 'TRX', 'NEAR', 'KAS', 'SUI', 'SEI', 'APT', 'ALGO', 'HBAR', 'XRP', 'BNB'],
+    'DeFi': ['UNI', 'LINK', 'AAVE', 'MKR', 'SNX', 'CRV', 'COMP', 'RUNE', 'INJ', 'JUP', 'DYDX', 'LDO'],
+    'AI & Big Data': ['TAO', 'FET', 'RNDR', 'NEAR', 'GRT', 'AGIX', 'WLD', 'OCEAN', 'JASMY', 'AKT'],
+    'Meme': ['DOGE', 'SHIB', 'PEPE', 'WIF', 'BONK', 'FLOKI', 'MEME', 'BOME', 'BRETT', 'MOG'],
+    'Gaming/Metaverse': ['ICP', 'IMX', 'SAND', 'MANA', 'AXS', 'GALA', 'BEAM', 'RON'],
+    'Layer 2': ['MATIC', 'ARB', 'OP', 'MNT', 'STRK', 'BLAST', 'BASE'],
+    'RWA': ['ONDO', 'POLYX', 'PENDLE']
+}
+SECTOR_BY_TICKER = {t: s for s, tickers in reversed(SECTORS.items()) for t in tickers}
+
+RESULT_PAGE_SIZE = max(1, int(os.environ.get("MITULAMA_RESULT_PAGE_SIZE", "24")))  # cards per page of a result list
+
+RESULT_LISTS = {
+    'watchlist': ['WATCHLIST', 'CORE ASSET', 'UNDERVALUED'],
+    'top': ['ALPHA', 'WHALE', 'BREAKOUT', 'BULLISH', 'TRENDING', 'BUZZ'],
+}
+
+@st.cache_resource(max_entries=4)
+def get_results_sector_view(results_key, _df):
+    """Sector and result-list flags per ticker plus sector aggregates of one set of screener results.
+    Returns (flags indexed by Ticker, pie_data, bar_df)"""
+    sector = _df['Ticker'].map(SECTOR_BY_TICKER).fillna('Others')
+    status = _df['Status'].astype(str)
+    flags = pd.DataFrame({
+        'Sector': sector.to_numpy(),
+        'watchlist': status.str.contains('|'.join(RESULT_LISTS['watchlist']), regex=True).to_numpy(),
+        'top': status.str.contains('|'.join(RESULT_LISTS['top']), regex=True).to_numpy(),
+        'all': (status != 'HOLD').to_numpy(),
+    }, index=_df['Ticker'].to_numpy())
+    flags = flags[~flags.index.duplicated()]
+    
+    # Count / mean per sector, in SECTORS order with Others last (empty sectors dropped)
+    stats = _df['Change %'].groupby(sector.to_numpy()).agg(['size', 'mean']).reindex(list(SECTORS) + ['Others']).dropna(subset=['size'])
+    pie_data = pd.DataFrame({'Sector': stats.index, 'Count': stats['size'].astype(int).to_numpy()})
+    if not pie_data.empty:
+        pie_data['Percent'] = ((pie_data['Count'] / pie_data['Count'].sum()) * 100).round(1)
+    bar_df = pd.DataFrame({'Sector': stats.index, 'Avg Change %': stats['mean'].to_numpy()}).dropna()
+    return flags, pie_data, bar_df
+
 # --- CONFIG DASHBOARD ---
 st.set_page_config(page_title="mitulama", page_icon="favicon.png", layout="wide")
 
 
-def render_market_analysis(df):
+def render_market_analysis(df, status_changes=None, results_key=None):
     # --- SECTOR ANALYSIS & CHARTS ---
+    status_changes = status_changes or {}
+    full_df = df  # Search index covers the whole result set, filters narrow it afterwards
     st.markdown("### MARKET & SECTOR ANALYSIS")
     
     # 1. Prepare Data for Charts
-    # Simple Sector Inference (Same as diag script)
-    sectors = {
-        'Layer 1': ['BTC', 'ETH', 'SOL', 'ADA', 'AVAX', 'DOT', 'TRX', 'NEAR', 'KAS', 'SUI', 'SEI', 'APT', 'ALGO', 'HBAR', 'XRP', 'BNB'],
-        'DeFi': ['UNI', 'LINK', 'AAVE', 'MKR', 'SNX', 'CRV', 'COMP', 'RUNE', 'INJ', 'JUP', 'DYDX', 'LDO'],
-        'AI & Big Data': ['TAO', 'FET', 'RNDR', 'NEAR', 'GRT', 'AGIX', 'WLD', 'OCEAN', 'JASMY', 'AKT'],
-        'Meme': ['DOGE', 'SHIB', 'PEPE', 'WIF', 'BONK', 'FLOKI', 'MEME', 'BOME', 'BRETT', 'MOG'],
-        'Gaming/Metaverse': ['ICP', 'IMX', 'SAND', 'MANA', 'AXS', 'GALA', 'BEAM', 'RON'],
-        'Layer 2': ['MATIC', 'ARB', 'OP', 'MNT', 'STRK', 'BLAST', 'BASE'],
-        'RWA': ['ONDO', 'POLYX', 'PENDLE']
-    }
-    
-    # Process df to get sector data
-    sector_counts = {k: 0 for k in sectors}
-    sector_counts['Others'] = 0
-    sector_performance = {k: [] for k in sectors}
-    sector_performance['Others'] = []
-    
-    for idx, row in df.iterrows():
-        ticker = row['Ticker']
-        chg = row['Change %']
-        assigned = False
-        for s, tickers in sectors.items():
-            if ticker in tickers:
-                sector_counts[s] += 1
-                sector_performance[s].append(chg)
-                assigned = True
-                break
-        if not assigned:
-            sector_counts['Others'] += 1
-            sector_performance['Others'].append(chg)
-
-    # Create DataFrames for Charts
-    # Pie Chart Data (Distribution)
-    pie_data = pd.DataFrame([{'Sector': k, 'Count': v} for k, v in sector_counts.items() if v > 0])
-    if not pie_data.empty:
-        pie_data['Percent'] = ((pie_data['Count'] / pie_data['Count'].sum()) * 100).round(1)
-    
-    # Bar Chart Data (Performance)
-    bar_data = []
-    for s, changes in sector_performance.items():
-        if changes:
-            avg_chg = sum(changes) / len(changes)
-            bar_data.append({'Sector': s, 'Avg Change %': avg_chg})
-    bar_df = pd.DataFrame(bar_data)
+    # Sector column, per-sector count / average change and list flags - once per scan version
+    view_key = results_key if results_key is not None else tuple(full_df['Ticker'])
+    flags, pie_data, bar_df = get_results_sector_view(view_key, full_df)
 
     # --- SECTOR INSIGHTS & METRICS ---
     if not pie_data.empty and not bar_df.empty:
@@ -394,18 +970,7 @@ def render_market_analysis(df):
             st.rerun()
         
         # Filtering logic
-        filtered_indices = []
-        for idx, row in df.iterrows():
-            ticker = row['Ticker']
-            sector_match = "Others"
-            for s, tickers in sectors.items():
-                if ticker in tickers:
-                    sector_match = s
-                    break
-            if sector_match == filter_sector:
-                filtered_indices.append(idx)
-        
-        df = df.iloc[filtered_indices]
+        df = df[(flags['Sector'].reindex(df['Ticker']) == filter_sector).to_numpy()]
 
     st.markdown("### Filter Hasil")
     
@@ -422,23 +987,21 @@ def render_market_analysis(df):
             search_submitted = st.form_submit_button("Cari", use_container_width=True)
     
     if result_search and (search_submitted or result_search):
-        search_term = result_search.lower()
-        df = df[
-            df['Ticker'].str.lower().str.contains(search_term) | 
-            df['Status'].str.lower().str.contains(search_term) |
-            df['Analysis'].str.lower().str.contains(search_term)
-        ]
+        # Ranked prefix/fuzzy matches over Ticker, Name, Status and Analysis (index built once per scan)
+        index = get_results_search_index(view_key, full_df)
+        shown = set(df['Ticker'])
+        ranked = [t for t in index.search(result_search) if t in shown]
+        df = df.set_index('Ticker', drop=False).loc[ranked].reset_index(drop=True)
         st.caption(f"Menampilkan {len(df)} hasil pencarian untuk '{result_search}'.")
     
-    watchlist_list = [r for i, r in df.iterrows() if any(s in r['Status'] for s in ['WATCHLIST', 'CORE ASSET', 'UNDERVALUED'])]
-    exclusive_hot_list = [r for i, r in df.iterrows() if any(s in r['Status'] for s in ['ALPHA', 'WHALE', 'BREAKOUT', 'BULLISH', 'TRENDING', 'BUZZ'])]
-    all_potential_list = [r for i, r in df.iterrows() if r['Status'] != 'HOLD']
-    total_potential = len(all_potential_list)
+    # List membership of the rows still shown (hash join on Ticker); cards are only built for the active list's page
+    shown = flags.reindex(df['Ticker'])
+    masks = {name: shown[name].fillna(False).to_numpy(dtype=bool) for name in ('all', 'watchlist', 'top')}
     
     result_tab_options = [
-        f"All ({total_potential})", 
-        f"Watchlist ({len(watchlist_list)})", 
-        f"Top Picks ({len(exclusive_hot_list)})"
+        f"All ({masks['all'].sum()})", 
+        f"Watchlist ({masks['watchlist'].sum()})", 
+        f"Top Picks ({masks['top'].sum()})"
     ]
     
     if 'active_result_tab' not in st.session_state:
@@ -461,13 +1024,30 @@ def render_market_analysis(df):
         label_visibility="collapsed"
     )
     
+    def set_result_page(page_key, page):
+        st.session_state[page_key] = page
+    
     def render_grid_inner(rows, key_prefix):
-        if not rows:
+        """Cards for one page of `rows` (DataFrame); detail research/news is only rendered for opened cards"""
+        if rows.empty:
             st.info("Belum ada asset yang memenuhi kriteria ini.")
             return
         
+        # Page resets when the list itself changes (search, sector filter, new scan)
+        pages = math.ceil(len(rows) / RESULT_PAGE_SIZE)
+        page_key = f"result_page_{key_prefix}"
+        signature = hash(tuple(rows['Ticker']))
+        if st.session_state.get(f"{page_key}_list") != signature:
+            st.session_state[f"{page_key}_list"] = signature
+            st.session_state[page_key] = 1
+        page = min(max(st.session_state.get(page_key, 1), 1), pages)
+        start = (page - 1) * RESULT_PAGE_SIZE
+        page_rows = rows.iloc[start:start + RESULT_PAGE_SIZE].to_dict('records')
+        st.caption(f"Menampilkan {start + 1}-{start + len(page_rows)} dari {len(rows)} asset")
+        
+        grid_started = time.perf_counter()
         cols = st.columns(3)
-        for idx, row in enumerate(rows):
+        for idx, row in enumerate(page_rows):
             with cols[idx % 3]:
                 st.markdown(f'<div id="card-{row['Ticker']}"></div>', unsafe_allow_html=True)
                 ticker_clean = row['Ticker']
@@ -491,6 +1071,12 @@ def render_market_analysis(df):
                         st.markdown(f"<span style='font-size: 18px; font-weight: 800; color: #fff;'>{format_price(row['Price'])}</span>", unsafe_allow_html=True)
                     with h_col2:
                         st.markdown(f"<div style='text-align: right; font-size: 11px; font-weight: 700; color: #848e9c; margin-top: 5px;'>{row['Status']}</div>", unsafe_allow_html=True)
+                        if pd.notna(row.get('Score')):
+                            st.markdown(f"<div style='text-align: right; font-size: 10px; color: #ff80ab;'>SCORE {row['Score']:.0f}</div>", unsafe_allow_html=True)
+                        change = status_changes.get(ticker_clean)
+                        if change:
+                            badge = "NEW" if change['type'] == 'ENTRY' else f"from {change['from']}"
+                            st.markdown(f"<div style='text-align: right; font-size: 9px; font-weight: 700; color: #ff2d75;'>{badge}</div>", unsafe_allow_html=True)
 
                     st.markdown(f'''
                         <div class="metrics-grid">
@@ -515,7 +1101,8 @@ def render_market_analysis(df):
                     analysis_title = row['Analysis'].split('\n')[0] if row['Analysis'] else "Analysis"
                     st.markdown(f"<div style='margin-top: 15px; font-weight: 700; color: #e0e0e0;'>{analysis_title}</div>", unsafe_allow_html=True)
                     
-                    with st.expander("Detail Riset & Berita"):
+                    # Detail content is only built for opened cards
+                    if st.toggle("Detail Riset & Berita", key=f"detail_{key_prefix}_{ticker_clean}"):
                         st.markdown(row['Analysis'])
                         st.markdown("---")
                         if row['News List']:
@@ -537,242 +1124,51 @@ def render_market_analysis(df):
                                 ''', unsafe_allow_html=True)
                         else: st.caption("Tidak ada berita spesifik hari ini.")
                     
-                    st.button(f"Load Chart", key=f"btn_{key_prefix}_{row['Ticker']}_{idx}", on_click=set_ticker, args=(row['Ticker'],), use_container_width=True)
+                    if st.button(f"Load Chart", key=f"btn_{key_prefix}_{row['Ticker']}_{start + idx}", use_container_width=True):
+                        set_ticker(row['Ticker'])
+                        st.rerun()  # Full rerun - header and chart live outside the screener fragment
+        get_render_timings().record("result_grid", time.perf_counter() - grid_started)
+        
+        if pages > 1:
+            n1, n2, n3 = st.columns([1, 2, 1])
+            with n1:
+                st.button("‹ Sebelumnya", key=f"{page_key}_prev", disabled=page <= 1, use_container_width=True,
+                          on_click=set_result_page, args=(page_key, page - 1))
+            with n2:
+                st.markdown(f"<div style='text-align: center; color: #848e9c; font-size: 12px; padding-top: 8px;'>Halaman {page} / {pages}</div>", unsafe_allow_html=True)
+            with n3:
+                st.button("Berikutnya ›", key=f"{page_key}_next", disabled=page >= pages, use_container_width=True,
+                          on_click=set_result_page, args=(page_key, page + 1))
 
     if active_tab.startswith("All"):
-        render_grid_inner(all_potential_list, "all")
+        render_grid_inner(df[masks['all']], "all")
         st.markdown("---")
         st.markdown("###  Tabel Detail Semua Asset")
-        st.markdown('''
-        <style>
-            [data-testid="stDataFrameResizable"] th {
-                background-color: #2a2e39 !important;
-                color: #848e9c !important;
-            }
-        </style>
-        ''', unsafe_allow_html=True)
-        st.dataframe(df[df['Status'] != 'HOLD'], use_container_width=True, hide_index=True)
+        st.dataframe(df[masks['all']], use_container_width=True, hide_index=True)
     elif active_tab.startswith("Watchlist"):
-        render_grid_inner(watchlist_list, "wl")
+        render_grid_inner(df[masks['watchlist']], "wl")
     elif active_tab.startswith("Top"):
-        render_grid_inner(exclusive_hot_list, "top")
+        render_grid_inner(df[masks['top']], "top")
 
 # --- CUSTOM CSS STOCKBIT STYLE ---
 # --- CUSTOM CSS PREMIUM DARK STYLE ---
 # --- CUSTOM CSS TRADINGVIEW / STOCKBIT PRO STYLE ---
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700&family=Inter:wght@400;600;700&display=swap');
-    
-    /* Google AdSense Main Script removed */
-</style>
-<style>
-    :root {
-        --primary: #ff2d75;
-        --secondary: #ff007f;
-        --bg-black: #0d0d12;
-        --card-bg: #1a1a24;
-        --border-pink: rgba(255, 45, 117, 0.3);
-        --glow: 0 0 10px rgba(255, 45, 117, 0.4);
-    }
-
-    /* Global Reset & Font */
-    html, body, [class*="css"] {
-        font-family: 'Inter', sans-serif !important;
-        background-color: var(--bg-black) !important;
-        color: #fce4ec !important;
-        font-size: 13px;
-        overflow-x: hidden !important;
-        scroll-behavior: smooth !important;
-    }
-
-    h1, h2, h3 {
-        font-family: 'Orbitron', sans-serif !important;
-        color: var(--primary) !important;
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        text-shadow: 0 0 15px rgba(255, 45, 117, 0.5);
-    }
-    
-    /* Sidebar (Watchlist) */
-    [data-testid="stSidebar"] {
-        background-color: #14141d !important;
-        border-right: 1px solid var(--border-pink);
-        width: 300px !important;
-    }
-    
-    /* Main Layout Gap */
-    .block-container {
-        padding-top: 1rem !important;
-        padding-bottom: 5rem !important;
-        padding-left: 2rem !important;
-        padding-right: 2rem !important;
-        max-width: 100% !important;
-        overflow-x: hidden !important;
-    }
-    
-    /* Metrics */
-    div[data-testid="stMetric"] {
-        background-color: rgba(255, 45, 117, 0.05) !important;
-        border: 1px solid var(--border-pink) !important;
-        padding: 10px !important;
-        border-radius: 8px !important;
-        box-shadow: var(--glow);
-    }
-    div[data-testid="stMetricLabel"] { font-size: 11px !important; color: #ff80ab !important; font-family: 'Orbitron', sans-serif;}
-    div[data-testid="stMetricValue"] { font-size: 18px !important; color: #fff !important; font-weight: 700;}
-    
-    /* Buttons (Cyber Style) */
-    .stButton > button {
-        background: linear-gradient(45deg, #ff2d75, #ff007f) !important;
-        color: white !important;
-        border-radius: 4px;
-        font-weight: 700;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        font-family: 'Orbitron', sans-serif;
-        border: none !important;
-        box-shadow: 0 4px 15px rgba(255, 0, 127, 0.3);
-        transition: all 0.3s ease;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(255, 0, 127, 0.5);
-    }
-    
-    /* Tabs (Cyber Panel) */
-    .stTabs [data-baseweb="tab-list"] {
-        background-color: #14141d;
-        padding: 5px 15px;
-        border-bottom: 2px solid var(--border-pink);
-        gap: 30px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        height: 45px;
-        background-color: transparent;
-        color: #ff80ab;
-        font-family: 'Orbitron', sans-serif;
-        font-size: 13px;
-        font-weight: 600;
-    }
-    .stTabs [aria-selected="true"] {
-        color: var(--primary) !important;
-        border-bottom: 3px solid var(--primary) !important;
-        text-shadow: 0 0 10px rgba(255, 45, 117, 0.5);
-    }
-    
-    /* Scrollbars */
-    ::-webkit-scrollbar { width: 8px; height: 8px; }
-    ::-webkit-scrollbar-track { background: #0d0d12; }
-    ::-webkit-scrollbar-thumb { background: #ff007f; border-radius: 10px; }
-    ::-webkit-scrollbar-thumb:hover { background: #ff2d75; }
-
-    /* Fix: Stop dimming effect */
-    div[data-testid="stVerticalBlock"] > div[style*="opacity"] {
-        opacity: 1 !important;
-    }
-
-    /* Metrics Grid Utility */
-    .metrics-grid {
-        display: grid;
-        grid-template-columns: repeat(2, 1fr);
-        gap: 12px;
-        margin-top: 15px;
-    }
-    .metric-item {
-        background: rgba(255, 45, 117, 0.05);
-        padding: 10px;
-        border: 1px solid var(--border-pink);
-        border-radius: 8px;
-        text-align: center;
-    }
-    .metric-label {
-        font-size: 10px;
-        color: #ff80ab;
-        font-family: 'Orbitron', sans-serif;
-        text-transform: uppercase;
-        display: block;
-        margin-bottom: 4px;
-    }
-    .metric-value {
-        font-size: 14px;
-        font-weight: 700;
-        color: #fff;
-    }
-
-
-    /* News Cards */
-    .news-card {
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    }
-    .news-card a {
-        text-decoration: none !important;
-        text-decoration-line: none !important;
-        border-bottom: none !important;
-    }
-    .news-card a:hover {
-        text-decoration: none !important;
-        border-bottom: none !important;
-    }
-    .news-card:hover {
-        background: rgba(255, 45, 117, 0.1) !important;
-        border-left-width: 6px !important;
-        transform: translateX(5px);
-    }
-
-    /* Cards */
-    div[data-testid="stExpander"] {
-        background: var(--card-bg) !important;
-        border: 1px solid var(--border-pink) !important;
-        border-radius: 10px !important;
-    }
-
-    /* --- RESPONSIVE ADJUSTMENTS --- */
-    @media (max-width: 1024px) {
-        .block-container {
-            padding-left: 1rem !important;
-            padding-right: 1rem !important;
-        }
-    }
-
-    @media (max-width: 768px) {
-        html, body, [class*="css"] {
-            font-size: 12px;
-        }
-        .main-header {
-            flex-direction: column !important;
-            align-items: flex-start !important;
-            gap: 15px !important;
-        }
-        .header-right {
-            width: 100% !important;
-            justify-content: space-between !important;
-            gap: 10px !important;
-        }
-        .metrics-grid {
-            grid-template-columns: 1fr;
-        }
-        div[data-testid="stMetricValue"] {
-            font-size: 16px !important;
-        }
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 10px;
-            padding: 5px 5px;
-        }
-        .stTabs [data-baseweb="tab"] {
-            font-size: 11px;
-            padding: 0 5px;
-        }
-    }
-    
-    /* Clean Hide for non-essential sidebar elements on mobile */
-    @media (max-width: 480px) {
-        div[data-testid="stMetricLabel"] { font-size: 9px !important; }
-        .metric-label { font-size: 9px !important; }
-        .mobile-hide { display: none !important; }
-    }
-
-""", unsafe_allow_html=True)
+# Stylesheets live in components/styles and are linked into the page by a tiny component:
+# a rerun only carries the sheet names + content hashes, the browser fetches each version once.
+STYLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "styles")
+STYLE_SHEETS = ["app.css", "sidebar.css", "ticker.css", "results.css"]  # cascade order
+STYLES_COMPONENT = components.declare_component("styles", path=STYLES_DIR)
+
+@st.cache_resource
+def get_style_versions():
+    """[[sheet, content hash]] - the hash is the cache-busting ?v= of each stylesheet URL"""
+    versions = []
+    for name in STYLE_SHEETS:
+        with open(os.path.join(STYLES_DIR, name), 'rb') as f:
+            versions.append([name, hashlib.md5(f.read()).hexdigest()[:12]])
+    return versions
+
+STYLES_COMPONENT(sheets=get_style_versions(), key="static_styles", default=None)
 
 # --- ANTI-BLOCKING MEASURES ---
 # 1. Daftar User-Agent untuk Rotasi
@@ -783,8 +1179,182 @@ USER_AGENTS = [
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36'
 ]
 
+# --- SNAPSHOT ARCHIVE (every universe pull, compressed Parquet partitioned by UTC day) ---
+# .snapshot_archive/date=YYYY-MM-DD/part-<ms>-<pid>.parquet, rows sorted by ticker.
+# Partitions older than ARCHIVE_DOWNSAMPLE_DAYS are compacted to one row per ticker per
+# ARCHIVE_DOWNSAMPLE_FREQ; partitions older than ARCHIVE_RETENTION_DAYS are dropped (0 = never).
+ARCHIVE_DIR = ".snapshot_archive"
+ARCHIVE_RETENTION_DAYS = int(os.environ.get("MITULAMA_ARCHIVE_RETENTION_DAYS", "90"))
+ARCHIVE_DOWNSAMPLE_DAYS = int(os.environ.get("MITULAMA_ARCHIVE_DOWNSAMPLE_DAYS", "7"))
+ARCHIVE_DOWNSAMPLE_FREQ = os.environ.get("MITULAMA_ARCHIVE_DOWNSAMPLE_FREQ", "1h")
+ARCHIVE_FIELDS = {
+    'price': 'current_price',
+    'volume': 'total_volume',
+    'market_cap': 'market_cap',
+    'change_24h': 'price_change_percentage_24h',
+}
+ARCHIVE_COMPACT_FILE = "compact.parquet"
+
+def _archive_partitions(start_day=None, end_day=None):
+    """[(day, dir)] of partitions inside [start_day, end_day], oldest first - others are never opened"""
+    partitions = []
+    if not os.path.isdir(ARCHIVE_DIR):
+        return partitions
+    for entry in os.scandir(ARCHIVE_DIR):
+        if not entry.name.startswith("date="):
+            continue
+        try:
+            day = datetime.strptime(entry.name[5:], "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        if (start_day is None or day >= start_day) and (end_day is None or day <= end_day):
+            partitions.append((day, entry.path))
+    return sorted(partitions)
+
+def _partition_files(part_dir):
+    return sorted(e.path for e in os.scandir(part_dir) if e.name.endswith(".parquet"))
+
+def append_market_snapshot(crypto_data, ts=None):
+    """Append one CoinGecko pull to today's partition"""
+    if not crypto_data: return
+    ts = ts or time.time()
+    rows = {}
+    for coin in crypto_data:
+        sym = coin['symbol'].upper()
+        if sym not in rows:  # Same first-wins rule as build_coin_map
+            rows[sym] = [coin.get(src) for src in ARCHIVE_FIELDS.values()]
+    df = pd.DataFrame.from_dict(rows, orient='index', columns=list(ARCHIVE_FIELDS)).astype('float64')
+    df.index.name = 'ticker'
+    df = df.sort_index().reset_index()
+    df.insert(0, 'ts', pd.Timestamp(ts, unit='s', tz='UTC').floor('ms'))
+    
+    day = datetime.fromtimestamp(ts, timezone.utc).date()
+    part_dir = os.path.join(ARCHIVE_DIR, f"date={day.isoformat()}")
+    new_day = not os.path.isdir(part_dir)
+    os.makedirs(part_dir, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path = os.path.join(part_dir, f"part-{int(ts * 1000)}-{os.getpid()}.parquet")
+    atomic_write(path, lambda f: pq.write_table(table, f, compression='zstd'))
+    if new_day:
+        maintain_snapshot_archive()  # Once a day: retention + downsampling
+
+def _to_utc(value):
+    if value is None or isinstance(value, pd.Timestamp) and value.tzinfo:
+        return value
+    if isinstance(value, (int, float)):
+        return pd.Timestamp(value, unit='s', tz='UTC')
+    value = pd.Timestamp(value)
+    return value.tz_localize('UTC') if value.tzinfo is None else value.tz_convert('UTC')
+
+def query_snapshot_archive(tickers=None, start=None, end=None, field='price'):
+    """ticker x time slice of the archive: DataFrame indexed by snapshot time (UTC), one column per ticker.
+    start/end: epoch seconds, datetime or string (inclusive, default unbounded). Only partitions
+    for days inside the window are read, and only the requested tickers' rows are decoded."""
+    start, end = _to_utc(start), _to_utc(end)
+    filters = [('ticker', 'in', [t.upper() for t in tickers])] if tickers else None
+    frames = []
+    for _, part_dir in _archive_partitions(start.date() if start is not None else None,
+                                           end.date() if end is not None else None):
+        for path in _partition_files(part_dir):
+            try:
+                frames.append(pq.read_table(path, columns=['ts', 'ticker', field], filters=filters).to_pandas())
+            except (OSError, pa.ArrowInvalid):
+                continue  # Compacted away while we were listing
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    if start is not None:
+        df = df[df['ts'] >= start]
+    if end is not None:
+        df = df[df['ts'] <= end]
+    return df.pivot_table(index='ts', columns='ticker', values=field, aggfunc='last').sort_index()
+
+def maintain_snapshot_archive(today=None):
+    """Drop partitions past retention and compact (downsample) old ones into a single file"""
+    today = today or datetime.now(timezone.utc).date()
+    with cache_file_lock(ARCHIVE_DIR):
+        for day, part_dir in _archive_partitions():
+            age = (today - day).days
+            if ARCHIVE_RETENTION_DAYS and age > ARCHIVE_RETENTION_DAYS:
+                shutil.rmtree(part_dir, ignore_errors=True)
+                continue
+            files = _partition_files(part_dir)
+            if not ARCHIVE_DOWNSAMPLE_DAYS or age <= ARCHIVE_DOWNSAMPLE_DAYS or \
+                    [os.path.basename(f) for f in files] == [ARCHIVE_COMPACT_FILE]:
+                continue
+            try:
+                df = pd.concat([pq.read_table(f).to_pandas() for f in files], ignore_index=True)
+                df['bucket'] = df['ts'].dt.floor(ARCHIVE_DOWNSAMPLE_FREQ)
+                df = df.sort_values('ts').groupby(['bucket', 'ticker'], as_index=False).last()
+                df = df.drop(columns='bucket').sort_values(['ticker', 'ts'])
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                atomic_write(os.path.join(part_dir, ARCHIVE_COMPACT_FILE),
+                             lambda f: pq.write_table(table, f, compression='zstd'))
+            except Exception:
+                continue
+            for f in files:
+                if os.path.basename(f) != ARCHIVE_COMPACT_FILE:
+                    try:
+                        os.remove(f)
+                    except OSError:
+                        pass
+
+# --- SPARKLINES (real price history from the archive, SVG paths cached per snapshot version) ---
+SPARKLINE_WINDOW = 7 * 86400  # Seconds of history per sparkline
+SPARKLINE_POINTS = 24
+SPARKLINE_WIDTH, SPARKLINE_HEIGHT = 60, 30
+
+def archive_version():
+    """Name of the newest archive part - changes exactly when a snapshot is appended"""
+    partitions = _archive_partitions()
+    if not partitions:
+        return None
+    files = _partition_files(partitions[-1][1])
+    return os.path.basename(files[-1]) if files else partitions[-1][0].isoformat()
+
+@observed_cache_data("sparklines", max_entries=2)
+def get_sparkline_paths(version):
+    """{ticker: SVG path 'M x,y L ...'} for every ticker with 2+ archived prices in the window.
+    All float work is one vectorized pass over the (time x ticker) matrix."""
+    if version is None:
+        return {}
+    prices = query_snapshot_archive(start=time.time() - SPARKLINE_WINDOW)
+    if len(prices) < 2:
+        return {}
+    prices = prices.loc[:, prices.notna().sum() >= 2].ffill().bfill()
+    # Downsample to a fixed point count (nearest snapshot to evenly spaced positions)
+    rows = np.linspace(0, len(prices) - 1, min(SPARKLINE_POINTS, len(prices))).round().astype(int)
+    values = prices.to_numpy()[rows]
+    lo, hi = values.min(axis=0), values.max(axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    ys = SPARKLINE_HEIGHT - (values - lo) / span * SPARKLINE_HEIGHT
+    ys[:, hi == lo] = SPARKLINE_HEIGHT / 2  # Flat line for unchanged prices
+    xs = np.linspace(0, SPARKLINE_WIDTH, len(rows))
+    coords = np.char.add(np.char.add(np.char.mod('%.1f', xs)[:, None], ','), np.char.mod('%.1f', ys))
+    return {
+        ticker: "M" + " L".join(column)
+        for ticker, column in zip(prices.columns, coords.T.tolist())
+    }
+
 # --- COINGECKO DATA FETCHING ---
-@st.cache_data(ttl=3600)
+UNIVERSE_TTL = 3600
+UNIVERSE_SNAPSHOT_FILE = ".universe_snapshot.arrow"  # Last good pull, memory-mapped on cold boot
+UNIVERSE_RETRY = 60  # Seconds before retrying a failed background refresh
+
+def save_universe_snapshot(crypto_data):
+    table = pa.Table.from_pylist(crypto_data).replace_schema_metadata({'saved_at': str(time.time())})
+    atomic_write(UNIVERSE_SNAPSHOT_FILE, lambda f: pa_feather.write_feather(table, f, compression='uncompressed'))
+
+def load_universe_snapshot():
+    """(crypto_data, saved_at) from the persisted universe, or (None, None)"""
+    try:
+        table = pa_feather.read_table(UNIVERSE_SNAPSHOT_FILE, memory_map=True)
+    except Exception:
+        return None, None
+    saved_at = float((table.schema.metadata or {}).get(b'saved_at', 0))
+    return table.to_pylist(), saved_at
+
+@observed_cache_data("universe", ttl=UNIVERSE_TTL)
 def get_top_crypto_tickers(count=1000):
     """Fetch top N cryptocurrencies from CoinGecko (multi-page)"""
     all_data = []
@@ -793,7 +1363,7 @@ def get_top_crypto_tickers(count=1000):
     
     try:
         for page in range(1, pages + 1):
-            url = f"https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page={per_page}&page={page}"
+            url = f"https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page={per_page}&page={page}&price_change_percentage=1h,24h,7d"
 
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
@@ -803,52 +1373,140 @@ def get_top_crypto_tickers(count=1000):
                 if pages > 1: time.sleep(0.5)
             else:
                 break
+        try:
+            append_market_snapshot(all_data[:count])  # Keep history for sparklines / baselines
+            if all_data:
+                save_universe_snapshot(all_data[:count])
+        except Exception:
+            pass
         return all_data[:count]
     except Exception as e:
         st.error(f"Error fetching data from CoinGecko: {e}")
         return []
 
+@st.cache_resource
+def get_universe_state():
+    """Per-process: when the in-memory universe was last filled, and the background refresh thread"""
+    return {'loaded_at': None, 'thread': None, 'retry_at': 0, 'lock': threading.Lock()}
+
+def _refresh_universe(state, count):
+    data = get_top_crypto_tickers(count)
+    if data:
+        state['loaded_at'] = time.time()
+    else:
+        get_top_crypto_tickers.clear()  # Don't pin an empty pull for an hour; keep serving the snapshot
+        state['retry_at'] = time.time() + UNIVERSE_RETRY
+
+def get_universe(count=1000):
+    """(crypto_data, stale_since) for this run.
+    Warm process: the cached pull (stale_since None). Cold process: the persisted snapshot, returned
+    immediately with its save time while a background thread fetches a fresh universe. Only a first
+    boot with no snapshot on disk blocks on CoinGecko."""
+    state = get_universe_state()
+    if state['loaded_at'] and time.time() - state['loaded_at'] < UNIVERSE_TTL:
+        return get_top_crypto_tickers(count), None
+    snapshot, saved_at = load_universe_snapshot()
+    if not snapshot:
+        data = get_top_crypto_tickers(count)
+        if data:
+            state['loaded_at'] = time.time()
+        return data, None
+    with state['lock']:
+        idle = state['thread'] is None or not state['thread'].is_alive()
+        if idle and time.time() >= state['retry_at']:
+            state['thread'] = threading.Thread(target=_refresh_universe, args=(state, count),
+                                               name="universe-refresh", daemon=True)
+            state['thread'].start()
+    return snapshot[:count], saved_at
+
+@st.fragment(run_every=1.0)
+def render_universe_refresh_status(stale_since):
+    """Stale-data marker; reruns the page once the background universe refresh lands"""
+    state = get_universe_state()
+    if state['loaded_at'] and state['loaded_at'] > stale_since:
+        invalidate_cache("watchlist")  # Built from the stale snapshot
+        st.rerun()
+    st.caption(f"Data snapshot {datetime.fromtimestamp(stale_since).strftime('%H:%M')} - memperbarui data pasar...")
+
 # Initialize TICKERS with CoinGecko data (Up to 1000 coins)
-CRYPTO_DATA = get_top_crypto_tickers(1000)
-
-
-
-# Ensure unique tickers and build map
-TICKERS = []
-COIN_MAP = {}
-seen_tickers = set()
-
-for coin in CRYPTO_DATA:
-    sym = coin['symbol'].upper()
-    if sym not in seen_tickers:
-        TICKERS.append(sym)
-        seen_tickers.add(sym)
-    # Map by symbol for quick lookup (if duplicate symbol, first one - usually high mcap - wins)
-    if sym not in COIN_MAP:
-        COIN_MAP[sym] = coin
-
-# --- CUSTOM CSS LOADING ANIMATION (Cyberpunk Style) ---
-def custom_loading_overlay(status_text="LOADING...", progress=0):
-    # Dynamic conic gradient for the ring - PINK THEME
-    gradient = f"conic-gradient(#ff007f {progress}%, #14141d 0)"
-    
-    return f"""<div id="loading-overlay" style="position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(13, 13, 18, 0.95); z-index: 9999; display: flex; flex-direction: column; justify-content: center; align-items: center; backdrop-filter: blur(8px);">
-        <!-- Circular Progress Container -->
-        <div style="position: relative; width: 140px; height: 140px; border-radius: 50%; background: {gradient}; display: flex; justify-content: center; align-items: center; margin-bottom: 25px; box-shadow: 0 0 30px rgba(255, 0, 127, 0.3); animation: pulse-ring 2s infinite;">
-            <!-- Inner Circle (Mask) -->
-            <div style="width: 120px; height: 120px; background: #0d0d12; border-radius: 50%; display: flex; justify-content: center; align-items: center; flex-direction: column; border: 1px solid rgba(255, 0, 127, 0.2);">
-                <div style="font-family: 'Orbitron', monospace; color: #fff; font-size: 28px; font-weight: bold; text-shadow: 0 0 10px rgba(255, 0, 127, 0.5);">{progress}%</div>
-            </div>
-            <!-- Spinning Border for activity indication -->
-            <div style="position: absolute; top: -8px; left: -8px; right: -8px; bottom: -8px; border: 2px solid transparent; border-top: 2px solid #ff2d75; border-radius: 50%; animation: spin 1s linear infinite;"></div>
-        </div>
-        <div style="font-family: 'Orbitron', monospace; color: #ff2d75; font-size: 20px; font-weight: bold; letter-spacing: 4px; text-shadow: 0 0 15px rgba(255, 45, 117, 0.6);">{status_text}</div>
-        <div style="font-family: 'Inter', sans-serif; color: #ff80ab; font-size: 13px; margin-top: 15px; opacity: 0.8;">Processing Cyber Assets...</div>
-        <style>
-            @keyframes spin {{ 0% {{ transform: rotate(0deg); }} 100% {{ transform: rotate(360deg); }} }}
-            @keyframes pulse-ring {{ 0% {{ box-shadow: 0 0 0 0 rgba(255, 0, 127, 0.4); }} 70% {{ box-shadow: 0 0 0 15px rgba(255, 0, 127, 0); }} 100% {{ box-shadow: 0 0 0 0 rgba(255, 0, 127, 0); }} }}
-        </style>
-    </div>"""
+CRYPTO_DATA, UNIVERSE_STALE_SINCE = get_universe(1000)
+
+
+
+def build_coin_map(crypto_data):
+    """Ensure unique tickers and build symbol -> coin map"""
+    tickers = []
+    coin_map = {}
+    for coin in crypto_data:
+        sym = coin['symbol'].upper()
+        # Map by symbol for quick lookup (if duplicate symbol, first one - usually high mcap - wins)
+        if sym not in coin_map:
+            tickers.append(sym)
+            coin_map[sym] = coin
+    return tickers, coin_map
+
+TICKERS, COIN_MAP = build_coin_map(CRYPTO_DATA)
+UNIVERSE_SEARCH_INDEX = get_universe_search_index(
+    hashlib.md5("|".join(f"{t}:{COIN_MAP[t].get('id')}:{COIN_MAP[t].get('name')}" for t in TICKERS).encode()).hexdigest(),
+    COIN_MAP
+)
+
+# --- MOVERS INDEX (top-K leaderboards, computed once per market snapshot) ---
+MOVERS_K = 50  # Entries kept per leaderboard
+MOVER_HORIZONS = {
+    '1h': 'price_change_percentage_1h_in_currency',
+    '24h': 'price_change_percentage_24h',
+    '7d': 'price_change_percentage_7d_in_currency',
+}
+VOLUME_BASELINE_WINDOW = 7 * 86400  # Archive window for the median volume behind volume spikes
+VOLUME_BASELINE_MIN = 3             # Snapshots needed before a baseline counts
+
+def top_k_indices(values, k, largest=True):
+    """Indices of the k largest (or smallest) non-NaN values, best first.
+    O(n) argpartition + O(k log k) sort of the winners only."""
+    valid = np.flatnonzero(~np.isnan(values))
+    k = min(k, valid.size)
+    if k == 0:
+        return valid[:0]
+    scores = -values[valid] if largest else values[valid]
+    winners = np.argpartition(scores, k - 1)[:k]
+    # Ties keep universe (market cap) order
+    return valid[winners[np.lexsort((valid[winners], scores[winners]))]]
+
+@st.cache_resource(max_entries=2)
+def get_movers_index(market_key, _coin_map):
+    """{board: [(ticker, value)]} for 1h/24h/7d gainers and losers, volume spikes and turnover leaders.
+    market_key identifies the snapshot (prices + archive version); a new board is one more column."""
+    tickers = list(_coin_map)
+    
+    def column(field):
+        return np.array([_coin_map[t].get(field) for t in tickers], dtype=float)  # None -> NaN
+    
+    def board(values, largest=True):
+        return [(tickers[i], float(values[i])) for i in top_k_indices(values, MOVERS_K, largest)]
+    
+    boards = {}
+    for horizon, field in MOVER_HORIZONS.items():
+        chg = column(field)
+        boards[f"gainers_{horizon}"] = board(np.where(chg > 0, chg, np.nan))
+        boards[f"losers_{horizon}"] = board(chg, largest=False)
+    
+    volume, market_cap = column('total_volume'), column('market_cap')
+    boards['turnover'] = board(volume / np.where(market_cap > 0, market_cap, np.nan))
+    try:
+        history = query_snapshot_archive(start=time.time() - VOLUME_BASELINE_WINDOW, field='volume')
+        baseline = history.median().where(history.count() >= VOLUME_BASELINE_MIN)
+        baseline = baseline.reindex(tickers).to_numpy(dtype=float)
+    except Exception:
+        baseline = np.full(len(tickers), np.nan)
+    boards['volume_spike'] = board(volume / np.where(baseline > 0, baseline, np.nan))
+    return boards
+
+MOVERS = get_movers_index(
+    (hashlib.md5(np.array([[c.get('current_price') or 0, c.get('total_volume') or 0] for c in COIN_MAP.values()]).tobytes()).hexdigest(),
+     archive_version()),
+    COIN_MAP
+)
 
 # --- FUNGSI ITUNG-ITUNGAN (Tech Indicators) ---
 def calculate_rsi(series, period=14):
@@ -862,12 +1520,91 @@ def calculate_obv(df):
     obv = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
     return obv
 
-@st.cache_data(ttl=600)
+# --- BATCHED OHLCV (Yahoo Finance, one download for the whole universe) ---
+OHLCV_TTL = 3600      # Daily bars - refresh hourly
+OHLCV_PERIOD = "6mo"  # Enough history for MA50 + RSI warm-up
+
+def _download_ohlcv(tickers):
+    """One batched yfinance call -> (close, volume) matrices indexed by date, columns = ticker"""
+    symbols = [f"{t}-USD" for t in tickers]
+    data = yf.download(symbols, period=OHLCV_PERIOD, interval="1d", group_by="column",
+                       auto_adjust=False, progress=False, threads=True)
+    if data is None or data.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    close = data['Close'].rename(columns=lambda c: c[:-4]).dropna(axis=1, how='all')
+    volume = data['Volume'].rename(columns=lambda c: c[:-4]).reindex(columns=close.columns)
+    return close, volume
+
+def load_ohlcv_matrix(tickers):
+    """Close/Volume matrices for `tickers`, cached on disk for OHLCV_TTL.
+    Only tickers never requested in the current cache window are downloaded."""
+    tickers = [t for t in dict.fromkeys(tickers) if t]
+    cache = None
+    if os.path.exists(OHLCV_CACHE_FILE):
+        try:
+            with open(OHLCV_CACHE_FILE, 'rb') as f:
+                cache = pickle.load(f)
+            if time.time() - cache['fetched_at'] > OHLCV_TTL:
+                get_cache_metrics().record("ohlcv_file", 'eviction')
+                cache = None
+        except:
+            cache = None
+    if cache is None:
+        cache = {'fetched_at': time.time(), 'requested': set(), 'close': pd.DataFrame(), 'volume': pd.DataFrame()}
+    
+    missing = [t for t in tickers if t not in cache['requested']]
+    if not missing:
+        get_cache_metrics().record("ohlcv_file", 'hit')
+    else:
+        start = time.time()
+        try:
+            close, volume = _download_ohlcv(missing)
+        except Exception:
+            get_cache_metrics().record("ohlcv_file", 'miss', time.time() - start)
+            return cache['close'], cache['volume']  # Offline / rate-limited: serve what we have
+        if not close.empty:
+            cache['close'] = pd.concat([cache['close'], close], axis=1)
+            cache['volume'] = pd.concat([cache['volume'], volume], axis=1)
+        cache['requested'].update(missing)
+        get_cache_metrics().record("ohlcv_file", 'miss', time.time() - start,
+                                   int(cache['close'].memory_usage().sum() + cache['volume'].memory_usage().sum()))
+        try:
+            with cache_file_lock(OHLCV_CACHE_FILE):
+                atomic_write(OHLCV_CACHE_FILE, lambda f: pickle.dump(cache, f))
+        except:
+            pass
+    return cache['close'], cache['volume']
+
+def compute_technicals(close, volume):
+    """RSI(14), OBV trend, MA20/MA50 and volume ratio for every ticker column in one vectorized pass"""
+    if close.empty:
+        return pd.DataFrame(columns=['rsi', 'obv_trend', 'ma20', 'ma50', 'vol_ratio', 'last_close'])
+    close = close.ffill()
+    rsi = calculate_rsi(close)
+    obv = calculate_obv({'Close': close, 'Volume': volume.fillna(0)})
+    return pd.DataFrame({
+        'rsi': rsi.iloc[-1],
+        'obv_trend': np.sign(obv.iloc[-1] - obv.iloc[-6]) if len(obv) > 5 else 0.0,  # 5-bar OBV slope
+        'ma20': close.rolling(20).mean().iloc[-1],
+        'ma50': close.rolling(50).mean().iloc[-1],
+        'vol_ratio': volume.iloc[-1] / volume.rolling(20).mean().iloc[-1],
+        'last_close': close.iloc[-1]
+    }).replace([np.inf, -np.inf], np.nan)
+
+@observed_cache_data("technicals", ttl=OHLCV_TTL)
+def get_technicals(tickers):
+    """{ticker: {'rsi', 'obv_trend', 'ma20', 'ma50', 'vol_ratio', 'last_close'}} (NaN-free keys only)"""
+    close, volume = load_ohlcv_matrix(list(tickers))
+    table = compute_technicals(close, volume)
+    table = table[table.index.isin(tickers)]
+    return {t: {k: v for k, v in row.items() if pd.notna(v)} for t, row in table.to_dict('index').items()}
+
+@observed_cache_data("crypto_stats", ttl=600)
 def get_crypto_stats(ticker):
     """Placeholder for custom crypto stats if needed, currently using COIN_MAP"""
     return None
 
-@st.cache_data(ttl=300)
+@observed_cache_data("global_market_stats", ttl=300)
 def get_global_market_stats():
     """Fetch global crypto market stats instead of IHSG"""
     try:
@@ -884,8 +1621,34 @@ def get_global_market_stats():
     except:
         return None
 
-@st.cache_data(ttl=1800) # Cache 30 mins - reduce news scraping
+@observed_cache_data("global_crypto_data", ttl=300)
+def get_global_crypto_data():
+    try:
+        res = requests.get("https://api.coingecko.com/api/v3/global")
+        return res.json()['data']
+    except:
+        return None
+
+NEWS_TTL = 1800 # Cache 30 mins - reduce news scraping
+# Per-ticker caches (memory LRU + disk), bounded by pickled size
+SENTIMENT_CACHE_MB = float(os.environ.get("MITULAMA_SENTIMENT_CACHE_MB", "16"))
+ANALYSIS_CACHE_MB = float(os.environ.get("MITULAMA_ANALYSIS_CACHE_MB", "32"))
+
+@st.cache_resource
+def get_tiered_cache(name, max_mb):
+    """One TieredCache per name per server process (disk tier gets 4x the memory budget)"""
+    return TieredCache(name, int(max_mb * 2**20), int(max_mb * 4 * 2**20))
+
+def current_news_version():
+    """News is re-fetched once per cache window, so the window index is its version"""
+    return int(time.time() // NEWS_TTL)
+
 def get_news_sentiment(ticker):
+    """Cached fetch_news_sentiment, keyed by (ticker, news version)"""
+    cache = get_tiered_cache("sentiment", SENTIMENT_CACHE_MB)
+    return cache.get_or_compute((ticker, current_news_version()), lambda: fetch_news_sentiment(ticker))
+
+def fetch_news_sentiment(ticker):
     """
     Advanced News Sentiment Analysis with Multi-Source Aggregation
     Returns: sentiment, headline, news_score, social_buzz, impact, news_list, analysis
@@ -973,9 +1736,12 @@ def get_news_sentiment(ticker):
     except Exception as e:
         return "NEUTRAL", f"Monitoring {ticker} market momentum", 50, 45, "LOW", [], f"Technical Fallback: {str(e)}"
 
-def analyze_crypto(ticker_symbol):
-    coin_data = COIN_MAP.get(ticker_symbol.upper())
+def analyze_crypto(ticker_symbol, coin_map=None, technicals=None):
+    coin_map = COIN_MAP if coin_map is None else coin_map
+    coin_data = coin_map.get(ticker_symbol.upper())
     if not coin_data: return None
+    # Daily-bar indicators from get_technicals() (empty when no Yahoo history is available)
+    tech = (technicals or {}).get(ticker_symbol.upper(), {})
     
     curr_price = coin_data.get('current_price', 0) or 0
     chg_pct = coin_data.get('price_change_percentage_24h', 0) or 0
@@ -1006,8 +1772,12 @@ def analyze_crypto(ticker_symbol):
     
     # Pillar 5: Chart Pattern Support
     # Check if price is holding above daily average or near high
-    daily_high = coin_data.get('high_24h', 0) or 1
-    is_chart_support = (curr_price > daily_high * 0.9)
+    if 'ma20' in tech:
+        # Real daily bars: above the 20-day MA and OBV not in distribution
+        is_chart_support = curr_price > tech['ma20'] and tech.get('obv_trend', 0) >= 0
+    else:
+        daily_high = coin_data.get('high_24h', 0) or 1
+        is_chart_support = (curr_price > daily_high * 0.9)
     
     # Status Determination (The 5-Pillar Synthesis)
     status = "HOLD"
@@ -1038,6 +1808,11 @@ def analyze_crypto(ticker_symbol):
         f"**Market Cap:** ${market_cap:,.0f} (Global Rank: #{coin_data.get('market_cap_rank', 'N/A')}).",
         f"**V/MCap Ratio:** {vol_mcap_ratio:.3f} (Turnover Intensity)."
     ]
+    if 'rsi' in tech:
+        research_points.append(
+            f"**Technicals (1D):** RSI {tech['rsi']:.1f}, {'above' if curr_price > tech.get('ma20', curr_price) else 'below'} MA20, "
+            f"OBV {'rising' if tech.get('obv_trend', 0) > 0 else 'flat/falling'}."
+        )
 
     analysis = f"CRYPTO ANALYSIS: {status}\n\n"
     analysis += "---\n\n"
@@ -1061,8 +1836,771 @@ def analyze_crypto(ticker_symbol):
         "Status": status,
         "News List": news_list,
         "Headline": headline,
-        "Raw Vol Ratio": vol_mcap_ratio
+        "Raw Vol Ratio": vol_mcap_ratio,
+        "RSI": tech.get('rsi'),
+        "Volume Ratio": tech.get('vol_ratio')
+    }
+
+# --- SCREENER ENGINE ---
+def screen_candidates(crypto_data):
+    """Tier 1 filter: cheap 5-pillar pre-screen over the CoinGecko snapshot"""
+    promising_tickers = []
+    for i, coin in enumerate(crypto_data):
+        price_chg = abs(coin.get('price_change_percentage_24h', 0) or 0)
+        vol_mcap_ratio = (coin.get('total_volume', 0) or 0) / (coin.get('market_cap', 1) or 1)
+        ath_chg = abs(coin.get('ath_change_percentage', 0) or 0)
+        
+        # Filter: Top 30 assets OR High Vol (>2.5%) OR Undervalued gem (>70% drop) OR High Activity (Vol/MCap > 0.08)
+        if i < 30 or price_chg > 2.5 or (ath_chg > 70 and vol_mcap_ratio > 0.05) or vol_mcap_ratio > 0.12:
+            promising_tickers.append(coin['symbol'].upper())
+    return promising_tickers
+
+# --- EXCLUSION INDEX (Stablecoins, Wrapped & Staked assets) ---
+# These can never be real signals, so they are masked out before Deep Analysis
+EXCLUDED_CATEGORIES = ['stablecoins', 'wrapped-tokens', 'liquid-staking-tokens', 'bridged-tokens']
+EXCLUSION_TTL = 86400  # Category membership changes slowly - rebuild daily
+PEG_REFERENCES = ['BTC', 'ETH', 'SOL', 'BNB']
+
+def load_exclusion_index():
+    """{coingecko_id: category} from CoinGecko category listings, cached on disk for EXCLUSION_TTL"""
+    cached = None
+    if os.path.exists(EXCLUSION_INDEX_FILE):
+        try:
+            with open(EXCLUSION_INDEX_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if time.time() - cached.get('built_at', 0) < EXCLUSION_TTL:
+                get_cache_metrics().record("exclusion_index_file", 'hit')
+                return cached['ids']
+            get_cache_metrics().record("exclusion_index_file", 'eviction')
+        except:
+            cached = None
+    
+    start = time.time()
+    ids = {}
+    for category in EXCLUDED_CATEGORIES:
+        try:
+            url = f"https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&category={category}&order=market_cap_desc&per_page=250&page=1"
+            response = requests.get(url, timeout=10)
+            if response.status_code == 200:
+                for coin in response.json():
+                    ids.setdefault(coin['id'], category)
+            time.sleep(0.5)
+        except:
+            continue
+    
+    get_cache_metrics().record("exclusion_index_file", 'miss', time.time() - start, payload_size(ids))
+    if not ids:
+        # Offline / rate-limited: keep using the stale index rather than dropping the mask
+        return cached['ids'] if cached else {}
+    try:
+        atomic_write(EXCLUSION_INDEX_FILE, lambda f: json.dump({'built_at': time.time(), 'ids': ids}, f), binary=False)
+    except:
+        pass
+    return ids
+
+def detect_pegged_assets(crypto_data):
+    """{coingecko_id: reason} for coins pegged to $1 or tracking a major asset (WBTC ~ BTC, WETH ~ ETH)"""
+    if not crypto_data:
+        return {}
+    ids = np.array([c.get('id', '') for c in crypto_data])
+    symbols = np.array([c['symbol'].upper() for c in crypto_data])
+    price = np.array([c.get('current_price') or 0 for c in crypto_data], dtype=float)
+    high = np.array([c.get('high_24h') or 0 for c in crypto_data], dtype=float)
+    low = np.array([c.get('low_24h') or 0 for c in crypto_data], dtype=float)
+    chg = np.abs(np.array([c.get('price_change_percentage_24h') or 0 for c in crypto_data], dtype=float))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        day_range = np.where(price > 0, (high - low) / price, np.inf)
+    pegged = {}
+    usd_peg = (np.abs(price - 1) < 0.02) & (chg < 1) & (day_range < 0.03)
+    for coin_id in ids[usd_peg]:
+        pegged[coin_id] = "usd-peg"
+    
+    for ref in PEG_REFERENCES:
+        ref_idx = np.flatnonzero(symbols == ref)
+        if not len(ref_idx) or price[ref_idx[0]] <= 0:
+            continue
+        ratio = price / price[ref_idx[0]]
+        tracks = (ratio > 0.97) & (ratio < 1.05) & (symbols != ref) & (np.char.find(symbols.astype(str), ref) >= 0)
+        for coin_id in ids[tracks]:
+            pegged.setdefault(coin_id, f"{ref.lower()}-peg")
+    return pegged
+
+def build_exclusion_index(crypto_data):
+    """Category index + peg detection over the current snapshot -> {coingecko_id: reason}"""
+    try:
+        index = dict(load_exclusion_index())
+    except Exception:
+        index = {}
+    index.update(detect_pegged_assets(crypto_data))
+    return index
+
+def screen_candidates_budgeted(crypto_data, budget):
+    """Tier 1 filter with a fixed deep-analysis budget.
+    
+    Fixed thresholds admit anywhere from 50 to 600 tickers depending on the day, so instead
+    each signal is ranked as a percentile over the current snapshot and the top-scoring
+    `budget` tickers are admitted. Top 30 by rank are always in (same as the threshold rule).
+    """
+    if not crypto_data:
+        return []
+    df = pd.DataFrame({
+        'symbol': [c['symbol'].upper() for c in crypto_data],
+        'move': [abs(c.get('price_change_percentage_24h', 0) or 0) for c in crypto_data],
+        'volume': [c.get('total_volume', 0) or 0 for c in crypto_data],
+        'mcap': [c.get('market_cap', 1) or 1 for c in crypto_data],
+        'ath_drop': [abs(c.get('ath_change_percentage', 0) or 0) for c in crypto_data],
+    }).drop_duplicates('symbol')
+    df['turnover'] = df['volume'] / df['mcap']
+    
+    pct = df[['move', 'turnover', 'ath_drop']].rank(pct=True)
+    # Undervalued (deep ATH drop) only counts with above-median activity, like the `vol_mcap_ratio > 0.05` rule
+    gem = pct['ath_drop'].where(df['turnover'] >= df['turnover'].quantile(0.5), 0)
+    score = pd.concat([pct['move'], pct['turnover'], gem], axis=1).max(axis=1)
+    score.iloc[:30] = np.inf
+    
+    return df.loc[score.nlargest(budget).index, 'symbol'].tolist()
+
+# --- CROSS-SECTIONAL FACTOR ENGINE ---
+# Composite weights. Override with MITULAMA_FACTOR_WEIGHTS="momentum=0.3,sentiment=0.1"
+DEFAULT_FACTOR_WEIGHTS = {'momentum': 0.25, 'turnover': 0.25, 'drawdown': 0.15, 'rel_strength': 0.20, 'sentiment': 0.15}
+
+def parse_factor_weights(spec, defaults=DEFAULT_FACTOR_WEIGHTS):
+    """"name=weight,..." over `defaults`, normalized to sum 1. Unknown names and bad weights are skipped."""
+    weights = dict(defaults)
+    for pair in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, _, value = pair.partition("=")
+        try:
+            weight = float(value)
+        except ValueError:
+            weight = None
+        if name.strip() not in weights or weight is None or not math.isfinite(weight) or weight < 0:
+            logger.warning("MITULAMA_FACTOR_WEIGHTS: ignoring %r", pair)
+            continue
+        weights[name.strip()] = weight
+    total = sum(weights.values())
+    if total <= 0:
+        logger.warning("MITULAMA_FACTOR_WEIGHTS: weights sum to 0, using defaults")
+        weights, total = dict(defaults), sum(defaults.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+FACTOR_WEIGHTS = parse_factor_weights(os.environ.get("MITULAMA_FACTOR_WEIGHTS"))
+
+def compute_factor_scores(crypto_data, sentiment=None, weights=None):
+    """Cross-sectional z-scores and percentile ranks of each factor over the snapshot.
+    
+    sentiment: {ticker: news score} for analyzed tickers (others count as neutral).
+    Returns a DataFrame indexed by Ticker with '<factor>_z', '<factor>_pct' and 'Score' (0-100).
+    """
+    weights = weights or FACTOR_WEIGHTS
+    if not crypto_data:
+        return pd.DataFrame(columns=['Score'])
+    df = pd.DataFrame({
+        'Ticker': [c['symbol'].upper() for c in crypto_data],
+        'chg': [c.get('price_change_percentage_24h') for c in crypto_data],
+        'chg_7d': [c.get('price_change_percentage_7d_in_currency') for c in crypto_data],
+        'volume': [c.get('total_volume') for c in crypto_data],
+        'mcap': [c.get('market_cap') for c in crypto_data],
+        'ath_chg': [c.get('ath_change_percentage') for c in crypto_data],
+    }).drop_duplicates('Ticker').set_index('Ticker').astype(float)
+    
+    # Relative strength is the 7d excess over BTC: a 24h excess would only be momentum shifted by a constant
+    btc_chg_7d = df['chg_7d'].get('BTC', np.nan)
+    raw = pd.DataFrame({
+        'momentum': df['chg'],
+        'turnover': df['volume'] / df['mcap'].where(df['mcap'] > 0),
+        'drawdown': -df['ath_chg'],  # Deeper below ATH = more room to recover
+        'rel_strength': df['chg_7d'] - (btc_chg_7d if pd.notna(btc_chg_7d) else df['chg_7d'].median()),
+        'sentiment': pd.Series(sentiment or {}, dtype=float).reindex(df.index),
+    })
+    
+    z = ((raw - raw.mean()) / raw.std(ddof=0).replace(0, np.nan)).clip(-3, 3)
+    pct = raw.rank(pct=True)
+    w = pd.Series(weights, dtype=float).reindex(raw.columns).fillna(0)
+    composite = z.fillna(0).mul(w).sum(axis=1) / (w.sum() or 1)
+    
+    out = pd.concat([z.add_suffix('_z'), pct.add_suffix('_pct')], axis=1)
+    out['Score'] = (composite.rank(pct=True) * 100).round(1)
+    return out
+
+# Incremental re-screening: a ticker is only re-analyzed when its inputs moved to a new bucket
+PRICE_BUCKET = 0.01   # 1% log-price buckets
+VOLUME_BUCKET = 0.05  # 5% log-volume buckets
+
+def _log_bucket(value, step):
+    return int(math.floor(math.log(value) / math.log1p(step))) if value and value > 0 else 0
+
+def input_fingerprint(coin, news_version):
+    """(price bucket, volume bucket, news version) - analysis inputs at screener resolution"""
+    return (
+        _log_bucket(coin.get('current_price'), PRICE_BUCKET),
+        _log_bucket(coin.get('total_volume'), VOLUME_BUCKET),
+        news_version
+    )
+
+def technicals_version(tech):
+    """Short digest of one ticker's technicals ('' when there are none)"""
+    if not tech:
+        return ""
+    return hashlib.md5(json.dumps(tech, sort_keys=True, default=str).encode()).hexdigest()[:8]
+
+def cached_analyze_crypto(ticker_symbol, coin_map=None, technicals=None):
+    """analyze_crypto through the analysis cache, keyed by (ticker, snapshot version, news version,
+    technicals version). The snapshot version is the ticker's price/volume bucket, so repeat lookups are
+    free until the market moves at screener resolution; an analysis made without OHLCV data is never
+    served to a caller that has it."""
+    coin_map = COIN_MAP if coin_map is None else coin_map
+    coin_data = coin_map.get(ticker_symbol.upper())
+    if not coin_data: return None
+    tech = (technicals or {}).get(ticker_symbol.upper())
+    key = (ticker_symbol.upper(),) + input_fingerprint(coin_data, current_news_version()) + (technicals_version(tech),)
+    cache = get_tiered_cache("analysis", ANALYSIS_CACHE_MB)
+    res = cache.get_or_compute(key, lambda: analyze_crypto(ticker_symbol, coin_map, technicals))
+    if res is None: return None
+    # Fresh copy with the cheap snapshot fields (callers annotate results in place)
+    return dict(res, **{
+        "Price": coin_data.get('current_price', 0) or 0,
+        "Change %": coin_data.get('price_change_percentage_24h', 0) or 0
+    })
+
+def run_screener_scan(crypto_data, progress_callback=None, previous=None, budget=None, cancel_event=None, deep_budget=None):
+    """Run Tier 1 filter + Deep Analysis without touching the UI (safe to call from a thread).
+    
+    previous: memo from the last scan ({ticker: {'fingerprint', 'result'}}). Tickers whose
+    fingerprint is unchanged are merged from it instead of being re-analyzed.
+    budget: wall-clock seconds for the whole scan; cancel_event: threading.Event to stop early.
+    deep_budget: max tickers sent to Deep Analysis (percentile selection); None = fixed thresholds.
+    When either fires, pending analyses are dropped and the results scored so far are
+    returned with stats['partial'] set.
+    Returns (results, memo, stats).
+    """
+    deadline = time.time() + budget if budget else None
+    previous = previous or {}
+    # Mask stablecoins / wrapped assets before selection; count the Deep Analyses this saves
+    exclusion_index = build_exclusion_index(crypto_data)
+    excluded_symbols = {c['symbol'].upper() for c in crypto_data if c.get('id') in exclusion_index}
+    select = (lambda data: screen_candidates_budgeted(data, deep_budget)) if deep_budget else screen_candidates
+    avoided = len(excluded_symbols.intersection(select(crypto_data)))
+    crypto_data = [c for c in crypto_data if c.get('id') not in exclusion_index]
+    
+    _, coin_map = build_coin_map(crypto_data)
+    promising_tickers = select(crypto_data)
+    news_version = current_news_version()
+    
+    memo = {}
+    reused = []
+    changed = []
+    for t in promising_tickers:
+        fp = input_fingerprint(coin_map[t], news_version)
+        prev = previous.get(t)
+        if prev and prev['fingerprint'] == fp:
+            # Refresh the cheap snapshot fields, keep the expensive analysis
+            coin = coin_map[t]
+            res = dict(prev['result'], **{
+                "Price": coin.get('current_price', 0) or 0,
+                "Change %": coin.get('price_change_percentage_24h', 0) or 0
+            })
+            memo[t] = {'fingerprint': fp, 'result': res}
+            reused.append(res)
+        else:
+            changed.append((t, fp))
+    
+    # One batched OHLCV load + vectorized indicators for every ticker that needs analysis
+    try:
+        technicals = get_technicals(tuple(t for t, _ in changed)) if changed else {}
+    except Exception:
+        technicals = {}
+    
+    results = list(reused)
+    done_count = 0
+    stop_reason = None
+    if changed:
+        total = len(changed)
+        executor = ThreadPoolExecutor(max_workers=25)
+        try:
+            futures = {executor.submit(cached_analyze_crypto, t, coin_map, technicals): (t, fp) for t, fp in changed}
+            pending = set(futures)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    stop_reason = "cancelled"
+                    break
+                if deadline is not None and time.time() >= deadline:
+                    stop_reason = "time budget"
+                    break
+                # Short waits so the cancel token / deadline are checked regularly
+                timeout = 0.5 if deadline is None else max(0, min(0.5, deadline - time.time()))
+                finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done_count += 1
+                    try:
+                        res = future.result()
+                    except Exception:
+                        res = None
+                    if res:
+                        t, fp = futures[future]
+                        memo[t] = {'fingerprint': fp, 'result': res}
+                        results.append(res)
+                    if progress_callback:
+                        progress_callback(done_count, total)
+        finally:
+            # Drop queued work; in-flight requests finish in the background and are discarded
+            executor.shutdown(wait=stop_reason is None, cancel_futures=True)
+    
+    # Continuous ranking for the grid/tables (cheap - recomputed for reused rows too)
+    if results:
+        factors = compute_factor_scores(crypto_data, {r['Ticker']: r['News Score'] for r in results})
+        for r in results:
+            r['Score'] = factors['Score'].get(r['Ticker'])
+        results.sort(key=lambda r: r['Score'] if r['Score'] is not None else -1, reverse=True)
+    
+    candidates = len(reused) + len(changed)
+    stats = {
+        'analyzed': done_count,
+        'reused': len(reused),
+        'candidates': candidates,
+        'coverage': (len(reused) + done_count) / candidates if candidates else 1.0,
+        'selection': f"top {deep_budget}" if deep_budget else "thresholds",
+        'excluded': avoided,
+        'partial': stop_reason is not None,
+        'stop_reason': stop_reason
     }
+    return results, memo, stats
+
+def diff_scan_results(prev_df, new_df):
+    """Keyed (Ticker) diff between two scans -> ENTRY / EXIT / STATUS_CHANGE events"""
+    if prev_df is None or new_df is None:
+        return []
+    merged = prev_df[['Ticker', 'Status']].drop_duplicates('Ticker').merge(
+        new_df[['Ticker', 'Status']].drop_duplicates('Ticker'),
+        on='Ticker', how='outer', suffixes=('_prev', '_new'), indicator=True
+    )
+    merged['type'] = None
+    merged.loc[merged['_merge'] == 'right_only', 'type'] = 'ENTRY'
+    merged.loc[merged['_merge'] == 'left_only', 'type'] = 'EXIT'
+    merged.loc[(merged['_merge'] == 'both') & (merged['Status_prev'] != merged['Status_new']), 'type'] = 'STATUS_CHANGE'
+    merged = merged[merged['type'].notna()].astype(object).where(merged.notna(), None)
+    return [
+        {'type': r['type'], 'ticker': r['Ticker'], 'from': r['Status_prev'], 'to': r['Status_new']}
+        for r in merged.to_dict('records')
+    ]
+
+def merge_partial_results(prev_df, partial_df):
+    """Rows of a partial scan laid over the previous results: tickers it didn't reach keep their last rows"""
+    if partial_df is None:
+        return prev_df
+    kept = prev_df[~prev_df['Ticker'].isin(partial_df['Ticker'])]
+    merged = pd.concat([partial_df, kept], ignore_index=True)
+    return merged.sort_values('Score', ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+
+# --- SCAN RUN COORDINATION (one in-flight scan per parameter set, across processes) ---
+# The owner touches its lock every SCAN_LOCK_HEARTBEAT seconds for the whole run (fetches included).
+# A lock untouched for SCAN_LOCK_STALE seconds, or whose owner pid is gone (same host), was left by a dead process.
+SCAN_LOCK_HEARTBEAT = 15
+SCAN_LOCK_STALE = 90
+
+def scan_lock_path(params):
+    """Lock file name for a parameter set, e.g. .screener_run_3f2a9c1b.lock"""
+    key = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()[:8]
+    return f".screener_run_{key}.lock"
+
+def _pid_alive(pid):
+    if os.name != 'posix' or not pid:
+        return True  # Can't tell - rely on the heartbeat
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # Exists, owned by another user
+    return True
+
+def scan_lock_abandoned(path, info=None):
+    """True when the lock at `path` belongs to a process that is no longer running the scan"""
+    try:
+        if time.time() - os.path.getmtime(path) > SCAN_LOCK_STALE:
+            return True
+    except OSError:
+        return False  # Already gone
+    info = read_scan_lock(path) if info is None else info
+    if info and info.get('host') == socket.gethostname():
+        return not _pid_alive(info.get('pid'))
+    return False
+
+def remove_abandoned_scan_lock(path):
+    """Remove the lock if (still) abandoned. True if it was removed."""
+    if scan_lock_abandoned(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return True
+    return False
+
+def acquire_scan_lock(path):
+    """Atomically create the run lock. Returns the owner record ({'pid', 'host', 'token'}) if this
+    process now owns the run, else None."""
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        if remove_abandoned_scan_lock(path):
+            return acquire_scan_lock(path)
+        return None
+    owner = {'pid': os.getpid(), 'host': socket.gethostname(), 'token': os.urandom(8).hex()}
+    with os.fdopen(fd, 'w') as f:
+        json.dump(dict(owner, started_at=time.time(), done=0, total=0), f)
+    return owner
+
+def owns_scan_lock(path, owner, info=None):
+    """True while the lock at `path` is still the one `owner` created (it may have been taken over as stale)"""
+    info = read_scan_lock(path) if info is None else info
+    return bool(info) and all(info.get(k) == v for k, v in owner.items())
+
+@contextmanager
+def scan_lock_heartbeat(path, owner, every=SCAN_LOCK_HEARTBEAT):
+    """Keep the lock's mtime fresh while the owner works (universe, exclusion index and OHLCV fetches included)"""
+    stop = threading.Event()
+    
+    def beat():
+        while not stop.wait(every):
+            if not owns_scan_lock(path, owner):
+                return  # Taken over - don't keep someone else's lock alive
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+    
+    threading.Thread(target=beat, name="scan-lock-heartbeat", daemon=True).start()
+    try:
+        yield
+    finally:
+        stop.set()
+
+def read_scan_lock(path):
+    """Progress record of the in-flight run, or None when no run holds the lock"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        return {}  # Being rewritten right now - still held
+
+def update_scan_lock(path, owner, done, total):
+    """Publish progress for attached processes (also refreshes the lock's mtime)"""
+    try:
+        info = read_scan_lock(path)
+        if not owns_scan_lock(path, owner, info):
+            return
+        info.update(done=done, total=total)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(info, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def release_scan_lock(path, owner):
+    """Remove the lock - unless another process has taken it over since (then it is theirs to remove)"""
+    if not owns_scan_lock(path, owner):
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+# --- BACKGROUND SCREENER (Shared Results) ---
+# Results are global (not per user), so one worker scans for every session
+SCREENER_INTERVAL = int(os.environ.get("MITULAMA_SCREENER_INTERVAL", "900"))  # seconds between scheduled scans
+SCREENER_BUDGET = int(os.environ.get("MITULAMA_SCREENER_BUDGET", "180"))  # wall-clock seconds per scan (0 = unlimited)
+SCREENER_DEEP_BUDGET = int(os.environ.get("MITULAMA_DEEP_BUDGET", "150"))  # max tickers per Deep Analysis (0 = fixed thresholds)
+
+def _drop_memo(memo, tickers=None):
+    """Scan memo without the entries of `tickers` (None = all)"""
+    return {} if tickers is None else {t: m for t, m in memo.items() if t not in tickers}
+
+class ScreenerWorker:
+    """Background thread that runs the screener on a fixed cadence and publishes versioned results"""
+    
+    def __init__(self, interval=SCREENER_INTERVAL, budget=SCREENER_BUDGET, deep_budget=SCREENER_DEEP_BUDGET):
+        self.interval = interval
+        self.budget = budget or None
+        self.deep_budget = deep_budget or None
+        self.lock_path = scan_lock_path({'budget': self.budget, 'deep_budget': self.deep_budget})
+        self.seen_snapshot = None  # Cache snapshot we last published or produced
+        self._lock = threading.Lock()
+        self._refresh = threading.Event()
+        self._cancel = threading.Event()
+        self.version = 0
+        self.runs = 0
+        self.results = None
+        self.timestamp = None
+        self.last_run = 0
+        self.running = False
+        self.progress = (0, 0)
+        self.last_error = None
+        self.last_stats = None
+        self.last_events = []
+        self._memo = {}
+        self._memo_resets = []  # reset_memo() calls made while a scan is running
+        self._priority = False
+        # Sessions waiting on a run ({session id: run number}) and the session whose request started the
+        # in-flight run (None for scheduled runs) - Stop only ends a run nobody else is waiting for
+        self._waiters = {}
+        self._pending_requester = None
+        self._requester = None
+        self.attached = False  # In-flight run belongs to another server process
+        self._lock_owner = None  # Owner record of the scan lock this process holds
+        
+        # Warm start from the shared cache file so a restart doesn't force a rescan
+        cached = load_cached_results()
+        if cached:
+            self.results = cached['results']
+            self.timestamp = cached['timestamp']
+            self.version = cached.get('version', 0) or 1
+            self.last_stats = cached.get('stats')
+            self.last_run = cached.get('saved_at', cached.get('last_heartbeat', 0))
+            self.seen_snapshot = cached.get('snapshot')
+        
+        self._thread = threading.Thread(target=self._loop, name="screener-worker", daemon=True)
+        self._thread.start()
+    
+    def snapshot(self):
+        """Latest published results: {'version', 'results', 'timestamp', 'events', 'stats'}"""
+        with self._lock:
+            return {'version': self.version, 'results': self.results, 'timestamp': self.timestamp,
+                    'events': self.last_events, 'stats': self.last_stats}
+    
+    def status(self):
+        """Small status record for polling: {'running', 'progress', 'runs', 'last_error'}"""
+        return {'running': self.running, 'progress': self.progress, 'runs': self.runs, 'last_error': self.last_error}
+    
+    def request_refresh(self, requester=None):
+        """Ask for a priority run on behalf of session `requester`. Returns the run number to wait for (see `runs`).
+        If a scan is already in flight, its results are fresh enough - no second run is queued."""
+        with self._lock:
+            target = self.runs + 1
+            if not self.running:
+                if not self._priority:
+                    self._pending_requester = requester
+                self._priority = True
+                self._refresh.set()
+            if requester is not None:
+                self._waiters[requester] = target
+        return target
+    
+    def _loop(self):
+        while True:
+            wait = max(0, self.last_run + self.interval - time.time())
+            self._refresh.wait(wait)
+            self._refresh.clear()
+            self._run_once()
+    
+    def cancel(self, requester, target):
+        """Stop session `requester` waiting on run `target`. The scan itself is only stopped (whatever was
+        scored so far is published as partial) when this session started it here and nobody else waits on it.
+        Returns True if the scan was stopped."""
+        with self._lock:
+            self._waiters.pop(requester, None)
+            stop = (self.running and not self.attached and requester is not None and self._requester == requester
+                    and target == self.runs + 1 and target not in self._waiters.values())
+            if stop:
+                self._cancel.set()
+        return stop
+    
+    def reset_memo(self, tickers=None):
+        """Forget per-ticker fingerprints (all, or only `tickers`) so the next run re-analyzes them"""
+        with self._lock:
+            self._memo = _drop_memo(self._memo, tickers)
+            if self.running:
+                self._memo_resets.append(tickers)  # The in-flight scan writes its memo back - forget these there too
+    
+    def _on_progress(self, done, total):
+        self.progress = (done, total)
+        if done == total or done % 10 == 0:
+            update_scan_lock(self.lock_path, self._lock_owner, done, total)
+    
+    def _publish(self, df, timestamp, stats, events=None):
+        """Bump the version and expose new results. The run owner (events=None) diffs, logs the events
+        and writes the cache; results adopted from another process come with the events it logged."""
+        version = self.version + 1  # Only this worker's thread publishes
+        if events is None:
+            if stats and stats.get('partial') and self.results is not None:
+                # Unscored tickers are missing, not gone - keep the set whole so no scan diffs against a fragment
+                df = merge_partial_results(self.results, df)
+            events = diff_scan_results(self.results, df)
+            now = time.time()
+            for event in events:
+                event.update(version=version, time=now)
+            if df is not None:
+                self.seen_snapshot = save_cached_results(df, timestamp, version, stats, events)
+            else:
+                with cache_file_lock(CACHE_META_FILE):
+                    append_screener_events(events)
+            events = [e for e in events if 'seq' in e]  # Failed to log - nobody else will see them either
+        with self._lock:
+            self.last_stats = stats
+            self.version = version
+            self.results = df
+            self.timestamp = timestamp
+            self.last_events = events
+    
+    def _adopt(self, cached):
+        """Publish results saved by another process, with the events it logged for them"""
+        self.seen_snapshot = cached.get('snapshot')
+        first, last = cached.get('event_seq') or (1, 0)
+        events = [e for e in load_screener_events(since_seq=first - 1) if e['seq'] <= last]
+        self._publish(cached['results'], cached['timestamp'], cached.get('stats'), events=events)
+    
+    def _attach_external_run(self):
+        """Another server process is running this scan: mirror its progress, then load its results.
+        Returns False (nothing published) when the owner turns out to be dead - its lock is removed."""
+        self.attached = True
+        while True:
+            info = read_scan_lock(self.lock_path)
+            if info is None or self._cancel.is_set():
+                break
+            if scan_lock_abandoned(self.lock_path, info) and remove_abandoned_scan_lock(self.lock_path):
+                self.attached = False
+                return False
+            self.progress = (info.get('done', 0), info.get('total', 0))
+            time.sleep(0.5)
+        cached = load_cached_results(known_snapshot=self.seen_snapshot)
+        if cached:
+            self._adopt(cached)
+        return True
+    
+    def _run_once(self):
+        with self._lock:
+            self.running = True
+            priority, self._priority = self._priority, False
+            self._requester, self._pending_requester = (self._pending_requester if priority else None), None
+            self._memo_resets = []
+        self._cancel.clear()
+        self.progress = (0, 0)
+        try:
+            # One scan per parameter set across all server processes; the rest attach to it
+            owner = acquire_scan_lock(self.lock_path)
+            if owner is None:
+                # Attached runs end here; a dead owner's run is taken over (unless someone else got there first)
+                owner = None if self._attach_external_run() else acquire_scan_lock(self.lock_path)
+                if owner is None:
+                    self.last_error = None
+                    return
+            self._lock_owner = owner
+            try:
+                with scan_lock_heartbeat(self.lock_path, owner):
+                    # Scheduled run: another process may have scanned recently - adopt that instead
+                    meta = None if priority else load_cached_meta()
+                    fresh = meta and time.time() - (meta.get('saved_at') or 0) < self.interval / 2
+                    cached = load_cached_results(known_snapshot=self.seen_snapshot) if fresh else None
+                    if cached:
+                        self._adopt(cached)
+                        self.last_error = None
+                        return
+
+                    crypto_data = get_top_crypto_tickers(1000)
+                    results, memo, stats = run_screener_scan(
+                        crypto_data, self._on_progress, self._memo, budget=self.budget, cancel_event=self._cancel,
+                        deep_budget=self.deep_budget
+                    )
+                    with self._lock:
+                        for tickers in self._memo_resets:
+                            memo = _drop_memo(memo, tickers)
+                        self._memo, self._memo_resets = memo, []
+                    df = pd.DataFrame(results) if results else None
+                    self._publish(df, time.strftime("%H:%M"), stats)
+                    self.last_error = None
+            finally:
+                release_scan_lock(self.lock_path, owner)
+        except Exception as e:
+            self.last_error = str(e)
+        finally:
+            with self._lock:
+                self.runs += 1
+                self._waiters = {r: t for r, t in self._waiters.items() if t > self.runs}
+                self._requester = None
+                self.attached = False
+            self.last_run = time.time()
+            self.running = False
+
+@st.cache_resource
+def get_screener_worker():
+    """One shared worker per server process"""
+    return ScreenerWorker()
+
+# --- CACHE DOMAINS (dependency-aware invalidation) ---
+# Each domain lists the domains derived from it; invalidating a domain also invalidates its dependents.
+# Caches keyed by their inputs need no edge: analysis is keyed by the ticker's price/volume bucket and
+# the ticker tape by the watchlist rows, so both follow a refreshed universe by themselves.
+CACHE_DEPENDENTS = {
+    "universe": ["watchlist", "asset_stats"],
+    "global_stats": [],
+    "watchlist": [],
+    "asset_stats": [],
+    "technicals": ["analysis"],
+    "news": ["analysis"],          # Per ticker
+    "analysis": [],                # Per ticker
+    "screener_results": [],
+}
+
+def _clear_cache_domain(domain, tickers=None):
+    if domain == "universe":
+        get_top_crypto_tickers.clear()
+        get_universe_state()['loaded_at'] = None  # Next run serves the snapshot while refreshing
+    elif domain == "global_stats":
+        get_global_market_stats.clear()
+        get_global_crypto_data.clear()
+        st.session_state.refresh_market = True
+    elif domain == "watchlist":
+        clear_watchlist_cache()
+        st.session_state.pop('watchlist_data_list', None)
+    elif domain == "asset_stats":
+        get_crypto_stats.clear()
+    elif domain == "technicals":
+        get_technicals.clear()
+    elif domain == "news":
+        get_tiered_cache("sentiment", SENTIMENT_CACHE_MB).clear(tickers)
+    elif domain == "analysis":
+        get_tiered_cache("analysis", ANALYSIS_CACHE_MB).clear(tickers)
+        get_screener_worker().reset_memo(tickers)
+    elif domain == "screener_results":
+        clear_cached_results()
+
+def invalidate_cache(domain, tickers=None):
+    """Invalidate `domain` (only `tickers` for per-ticker domains) and everything downstream of it.
+    Returns the domains cleared, in order."""
+    tickers = None if tickers is None else {t.upper() for t in tickers}
+    cleared = []
+    pending = [domain]
+    while pending:
+        d = pending.pop(0)
+        if d in cleared:
+            continue
+        _clear_cache_domain(d, tickers)
+        cleared.append(d)
+        pending.extend(CACHE_DEPENDENTS[d])
+    return cleared
+
+@st.fragment(run_every=1.0)
+def render_screener_job_status(target_run):
+    """Lightweight poll of the background scan - only this block reruns while the page stays usable"""
+    screener = get_screener_worker()
+    status = screener.status()
+    if status['runs'] >= target_run:
+        st.rerun()  # Results are published - full rerun picks them up
+    
+    done, total = status['progress']
+    prog_deep = int(done / total * 100) if total else 0
+    s_col1, s_col2 = st.columns([6, 1])
+    with s_col1:
+        st.progress(prog_deep / 100, text=f"Deep Analysis {done}/{total}..." if total else "Menganalisis crypto potensial...")
+    with s_col2:
+        if st.button("Stop", key="stop_scr_job", use_container_width=True, help="Stop and show partial results"):
+            if not screener.cancel(st.session_state.screener_session, target_run):
+                # Someone else still needs this scan: only this session stops waiting
+                st.session_state.screener_job = None
+                st.session_state.screener_detached = True
+                st.rerun()
 
 # Helper untuk mengubah ticker dari News Feed
 def set_ticker(ticker):
@@ -1073,6 +2611,67 @@ def set_ticker(ticker):
     # Auto-collapse sidebar on mobile
     st.session_state.collapse_sidebar = True
 
+# --- SIDEBAR WATCHLIST COMPONENT (virtual scrolling, rows as compact JSON) ---
+# The component keeps the row table of the current watchlist and reports its version back, so reruns
+# (e.g. filter keystrokes) only send row indices. Sparklines are sent for the first screen and for
+# the rows the component asks for as it scrolls.
+WATCHLIST_COMPONENT = components.declare_component(
+    "watchlist", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "watchlist")
+)
+WATCHLIST_ROW_HEIGHT = 46
+WATCHLIST_MAX_HEIGHT = 560
+WATCHLIST_FIRST_SCREEN = WATCHLIST_MAX_HEIGHT // WATCHLIST_ROW_HEIGHT + 7  # Rows painted before any scroll (+ overscan)
+WATCHLIST_INLINE_ROWS = 50  # Shorter lists (leaderboards, narrow filters) send their own rows instead of the table
+
+def watchlist_rows(watchlist, archive):
+    """Row table for the component, built once per (watchlist content, archive version) and kept in the session:
+    {'version', 'rows', 'index': {ticker: row index}, 'logo_prefix', 'archive'}.
+    Row: [ticker, name, price text, chg %, logo URL minus logo_prefix]"""
+    content = hash(tuple((item['ticker'], item['name'], item['price'], item.get('chg'), item.get('logo')) for item in watchlist))
+    cache_key = (content, archive)
+    cached = st.session_state.get('_watchlist_rows')
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    logos = [item.get('logo') or '' for item in watchlist]
+    logo_prefix = os.path.commonprefix([l for l in logos if l]) if any(logos) else ''
+    table = {
+        'version': f"{content & 0xffffffff:08x}",
+        'rows': [[item['ticker'], item['name'], format_price(item['price']), round(item.get('chg') or 0, 2),
+                  logo[len(logo_prefix):] if logo else '']
+                 for item, logo in zip(watchlist, logos)],
+        'index': {item['ticker']: i for i, item in enumerate(watchlist)},
+        'logo_prefix': logo_prefix,
+        'archive': archive,
+    }
+    st.session_state._watchlist_rows = (cache_key, table)
+    return table
+
+def render_watchlist(items, table, key, list_key="", empty_text="No data", chg=None):
+    """Render watchlist items as one component; returns the clicked ticker (once per click) or None.
+    chg: {ticker: % change} to show instead of the 24h change (e.g. 1h / 7d leaderboards)"""
+    # Last message from the component: the row table version it holds and the visible rows lacking a sparkline
+    state = st.session_state.get(key) or {}
+    order = [table['index'][item['ticker']] for item in items]
+    sparklines = get_sparkline_paths(table['archive'])
+    wanted = [table['rows'][i][0] for i in order[:WATCHLIST_FIRST_SCREEN]] + list(state.get('want') or [])[:100]
+    if len(order) <= WATCHLIST_INLINE_ROWS:
+        version, rows, order = None, [table['rows'][i] for i in order], list(range(len(order)))
+    else:
+        version = table['version']
+        rows = None if state.get('version') == version else table['rows']
+    event = WATCHLIST_COMPONENT(
+        version=version, rows=rows, logo_prefix=table['logo_prefix'], order=order,
+        chg=[round(chg.get(item['ticker']) or 0, 2) for item in items] if chg else None,
+        spark_version=table['archive'], sparks={t: sparklines.get(t) for t in wanted},
+        row_height=WATCHLIST_ROW_HEIGHT, max_height=WATCHLIST_MAX_HEIGHT,
+        list_key=list_key, empty_text=empty_text, key=key, default=None
+    )
+    # The component keeps its last value across reruns - only act on a new click
+    if event and event.get('ticker') and event.get('nonce') != st.session_state.get(f"{key}_nonce"):
+        st.session_state[f"{key}_nonce"] = event['nonce']
+        return event.get('ticker')
+    return None
+
 # --- MOBILE HELPERS ---
 if 'collapse_sidebar' not in st.session_state:
     st.session_state.collapse_sidebar = False
@@ -1136,9 +2735,6 @@ if 'scroll_to_top' not in st.session_state:
 if 'show_search' not in st.session_state:
     st.session_state.show_search = False
 
-if 'watchlist_limit' not in st.session_state:
-    st.session_state.watchlist_limit = 20
-
 # JavaScript for scrolling to top
 if st.session_state.get('scroll_to_top', False):
     import time
@@ -1182,78 +2778,18 @@ if st.session_state.get('scroll_to_top', False):
         height=0
     )
     # Set back to False so it doesn't scroll on EVERY rerun, only when triggered
-    st.session_state.scroll_to_top = False
-
-
-# --- DATA PRE-FETCHING (Global) ---
-if 'market_stats_live' not in st.session_state or st.session_state.get('refresh_market', False):
-    st.session_state.market_stats_live = get_global_market_stats()
-    st.session_state.refresh_market = False
-
-# --- UI COMPONENT: SIDEBAR (WATCHLIST ONLY) ---
-with st.sidebar:
-    # Custom Reference CSS
-    st.markdown("""
-    <style>
-        /* Premium Sidebar UI - Reference Style */
-        .wl-ticker { font-weight: 700; font-size: 14px; color: #fff; line-height: 1.2; }
-        .wl-name { font-size: 10px; color: #848e9c; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
-        .wl-price { font-weight: 700; font-size: 14px; text-align: right; color: #fff; line-height: 1.2; }
-        .wl-chg { font-size: 11px; text-align: right; display: flex; align-items: center; justify-content: flex-end; gap: 3px; }
-        .up { color: #00c853 !important; }
-        .down { color: #ff5252 !important; }
-        
-        /* Sidebar Tab Refinement - KILL ALL GREEN BOXES */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 15px; border-bottom: 1px solid rgba(255,255,255,0.05); padding-bottom: 2px; background-color: transparent !important;
-        }
-        .stTabs [data-baseweb="tab"] {
-            height: 35px; background-color: transparent !important; border: none !important;
-            padding: 0 5px !important; color: #848e9c !important; font-size: 13px !important;
-            transition: all 0.2s; box-shadow: none !important;
-        }
-        .stTabs [aria-selected="true"] {
-            color: #10d35e !important; border-bottom: 2px solid #10d35e !important;
-            background-color: transparent !important; font-weight: 700 !important;
-        }
-        /* Aggressive strike on Streamlit's internal tab styling */
-        .stTabs [data-baseweb="tab"] > div,
-        .stTabs [data-baseweb="tab"] p,
-        .stTabs [data-baseweb="tab"] span {
-            background-color: transparent !important;
-            background: transparent !important;
-            border: none !important;
-        }
-        
-        /* Ticker Button Reset - PURE TEXT FOR LISTS ONLY */
-        .ticker-btn-wrapper button {
-            background: transparent !important;
-            border: none !important;
-            padding: 0 !important;
-            text-align: left !important;
-            color: #fff !important;
-            font-size: 14px !important;
-            font-weight: 700 !important;
-            box-shadow: none !important;
-            min-height: 0 !important;
-            line-height: 1.2 !important;
-        }
-        .ticker-btn-wrapper button:hover {
-            color: #fff !important;
-            text-shadow: 0 0 10px #ff2d75;
-            background: rgba(255, 45, 117, 0.15) !important;
-            border-radius: 4px;
-            padding-left: 5px !important;
-            transition: all 0.2s ease;
-        }
-        
-        /* Row Styling */
-        .wl-row-container {
-            padding: 10px 0; border-bottom: 1px solid rgba(255,255,255,0.03);
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.session_state.scroll_to_top = False
+
+
+# --- DATA PRE-FETCHING (Global) ---
+if 'market_stats_live' not in st.session_state or st.session_state.get('refresh_market', False):
+    st.session_state.market_stats_live = get_global_market_stats()
+    st.session_state.refresh_market = False
 
+# --- UI COMPONENT: SIDEBAR (WATCHLIST ONLY) ---
+@timed_fragment("sidebar")
+def render_sidebar():
+    """Filter, refresh and watchlist / mover tabs - typing, tab and horizon changes rerun only the sidebar"""
     st.markdown("""
     <div style="margin-bottom: 16px; text-align: center;">
         <div style="font-size: 18px; font-weight: 800; background: -webkit-linear-gradient(45deg, #ff2d55, #ff80ab); -webkit-background-clip: text; -webkit-text-fill-color: transparent; letter-spacing: 1px;">
@@ -1273,20 +2809,15 @@ with st.sidebar:
         ).upper()
     with s_col[1]:
         if st.button("↻", help="Refresh Data", use_container_width=True, type="secondary"):
-            # Don't clear global cache, only news/analysis
-            get_news_sentiment.clear()
-            get_crypto_stats.clear()
-            clear_watchlist_cache()
-            clear_cached_results()
-            if 'watchlist_data_list' in st.session_state:
-                del st.session_state.watchlist_data_list
-            st.session_state.refresh_market = True 
+            # Fresh prices: universe (+ watchlist built from it) and global stats. News/analysis survive.
+            invalidate_cache("universe")
+            invalidate_cache("global_stats")
             st.rerun()
 
     st.markdown("<div style='margin-bottom: 5px;'></div>", unsafe_allow_html=True)
     
     # Tabs for Watchlist / Gainer / Loser
-    tab_wl, tab_gainer, tab_loser = st.tabs(["Watchlist", "Gainer", "Loser"])
+    tab_wl, tab_gainer, tab_loser, tab_volume = st.tabs(["Watchlist", "Gainer", "Loser", "Volume"])
     
     # --- WATCHLIST LOGIC ---
 
@@ -1334,110 +2865,23 @@ with st.sidebar:
                 st.session_state.watchlist_data_list = wl
                 save_watchlist_cache(wl)
             
-    # Helper for SVG Sparkline (Premium Reference Style)
-    def make_sparkline(data, color):
-        if not data: return ""
-        width = 80
-        height = 30
-        min_y, max_y = min(data), max(data)
-        # Pad range for visual headroom
-        y_range = max_y - min_y if max_y != min_y else 1
-        min_y -= y_range * 0.1
-        max_y += y_range * 0.1
-        y_range = max_y - min_y
-        
-        pts = []
-        for i, val in enumerate(data):
-            x = (i / (len(data)-1)) * width
-            y = height - ((val - min_y) / y_range) * height
-            pts.append(f"{x},{y}")
-        polyline = " ".join(pts)
-        
-        # Add a dashed reference line
-        ref_y = height / 2 + 2 
-        
-        return f'''
-        <svg width="{width}" height="{height}" style="overflow:visible;">
-            <line x1="0" y1="{ref_y}" x2="{width}" y2="{ref_y}" stroke="rgba(255,255,255,0.1)" stroke-width="1" stroke-dasharray="2,2" />
-            <polyline points="{polyline}" fill="none" stroke="{color}" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round" />
-        </svg>
-        '''
-
-    # Apply Filter to Main List
+    # Component row table (price text, short logo path) is prepared once per watchlist / snapshot
+    wl_rows = watchlist_rows(st.session_state.watchlist_data_list, archive_version())
+    
+    # Apply Filter to Main List (ranked prefix/fuzzy matches from the universe index)
     final_watchlist = st.session_state.watchlist_data_list
     if filter_query:
-        final_watchlist = [
-            item for item in final_watchlist 
-            if filter_query in item['ticker'].upper() or filter_query in item['name'].upper()
-        ]
+        wl_by_ticker = {item['ticker']: item for item in final_watchlist}
+        final_watchlist = [wl_by_ticker[t] for t in UNIVERSE_SEARCH_INDEX.search(filter_query) if t in wl_by_ticker]
 
-    # Render Loop - Watchlist Tab
+    # Render - one virtual-scrolling component per tab (only visible rows hit the DOM)
     with tab_wl:
-        # If filtering, show all results. If not, respect limit.
-        display_list = final_watchlist if filter_query else final_watchlist[:st.session_state.watchlist_limit]
-        
-        if not display_list:
-            st.caption("No assets found.")
-            
-        for item in display_list:
-            # Fallback for 'id' to fix KeyError
-            coin_id = item.get('id', item['ticker'])
-            # Layout: [Logo] [Ticker/Name] [Sparkline] [Price/Chg]
-            # OLD: [1, 4, 3, 3] -> Price was wrapping
-            # NEW: [1.3, 3.5, 2.2, 4.5] -> More space for Price, less for Sparkline
-            r_col1, r_col2, r_col3, r_col4 = st.columns([1.3, 3.5, 2.2, 4.5])
-            
-            with r_col1:
-                # Logo (Circular)
-                st.markdown(f"""
-                    <div style="width:28px; height:28px; border-radius:50%; overflow:hidden; background:rgba(255,255,255,0.05); margin-top:5px; border: 1px solid var(--border-pink);">
-                        <img src="{item['logo']}" style="width:100%; height:100%; object-fit:contain;">
-                    </div>
-                """, unsafe_allow_html=True)
-                
-            with r_col2:
-                # Ticker & Name 
-                st.markdown('<div class="ticker-btn-wrapper">', unsafe_allow_html=True)
-                if st.button(item['ticker'], key=f"btn_wl_{coin_id}", use_container_width=True):
-                    set_ticker(item['ticker'])
-                st.markdown('</div>', unsafe_allow_html=True)
-                st.markdown(f"<div class='wl-name' style='margin-top:-15px; color:#ff80ab;'>{item['name']}</div>", unsafe_allow_html=True)
-                
-            with r_col3:
-                # Sparkline
-                trend_color = "#00c853" if item['chg'] >= 0 else "#ff5252"
-                trend_data = [
-                    item['price'] * (1 + (random.uniform(0, 0.03) if item['chg'] < 0 else -random.uniform(0, 0.03)))
-                    for _ in range(8)
-                ]
-                trend_data.append(item['price'])
-                st.markdown(f"<div style='margin-top:5px;'>{make_sparkline(trend_data, trend_color)}</div>", unsafe_allow_html=True)
-                
-            with r_col4:
-                # Price & Change
-                is_up = item['chg'] >= 0
-                color = "#00c853" if is_up else "#ff5252"
-                arrow = "↗" if is_up else "↘"
-                diff = abs(item['price'] * (item['chg']/100))
-                
-                st.markdown(f"""
-                <div style="text-align: right; margin-top:2px;">
-                    <div class="wl-price">{format_price(item['price'])}</div>
-                    <div class="wl-chg" style="color:{color};">
-                        {arrow} ({item['chg']:.2f}%)
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("<div style='margin-bottom: 2px; border-bottom: 1px solid rgba(255,255,255,0.03);'></div>", unsafe_allow_html=True)
-        
-        # Load More Button (Only if NOT filtering)
-        if not filter_query and len(final_watchlist) > st.session_state.watchlist_limit:
-            if st.button("Load More", use_container_width=True):
-                st.session_state.watchlist_limit += 20
-                st.rerun()
+        clicked = render_watchlist(final_watchlist, wl_rows, "wl_list", filter_query, "No assets found.")
+        if clicked:
+            set_ticker(clicked)
+            st.rerun()  # New asset: header, chart and stats follow it
         
-        st.caption(f"Showing {len(display_list)} of {len(final_watchlist)} assets")
+        st.caption(f"Showing {len(final_watchlist)} assets")
         # Integrasi Global Stats di sidebar
         if 'market_stats_live' in st.session_state and st.session_state.market_stats_live:
             stats = st.session_state.market_stats_live
@@ -1446,103 +2890,64 @@ with st.sidebar:
         else:
             st.caption("Crypto Market (Live)")
     
-    with tab_gainer:
-        # Filter out items with None in 'chg' and sort
-        items_with_chg = [i for i in final_watchlist if i.get('chg') is not None and i.get('chg') > 0]
-        # Sort logic: if filtering, maybe just show all valid gainers filtered? 
-        # But 'final_watchlist' is already filtered. So just sort.
-        gainers = sorted(items_with_chg, key=lambda x: x['chg'], reverse=True)
-        # Limit to 10 only if NOT filtering
+    # Leaderboards read the precomputed movers index (O(K)); a filter sorts only its own matches
+    wl_by_ticker = {item['ticker']: item for item in st.session_state.watchlist_data_list}
+    
+    def leaderboard(board, field=None, largest=True, positive=False):
+        """(items, {ticker: value}) - top 10 of `board`, or every filter match ranked by `field`"""
         if not filter_query:
-            gainers = gainers[:10]
-            
-        if not gainers:
-             st.info("No data")
-
-        for item in gainers:
-            coin_id = item.get('id', item['ticker'])
-            r_col1, r_col2, r_col3, r_col4 = st.columns([1.3, 3.5, 2.2, 4.5])
-            with r_col1:
-                st.markdown(f"""
-                    <div style="width:28px; height:28px; border-radius:50%; overflow:hidden; background:rgba(255,255,255,0.05); margin-top:5px; border: 1px solid var(--border-pink);">
-                        <img src="{item['logo']}" style="width:100%; height:100%; object-fit:contain;">
-                    </div>
-                """, unsafe_allow_html=True)
-            with r_col2:
-                st.markdown('<div class="ticker-btn-wrapper">', unsafe_allow_html=True)
-                if st.button(item['ticker'], key=f"btn_g_{coin_id}", use_container_width=True):
-                    set_ticker(item['ticker'])
-                st.markdown('</div>', unsafe_allow_html=True)
-                st.markdown(f"<div class='wl-name' style='margin-top:-15px; color:#ff80ab;'>{item['name']}</div>", unsafe_allow_html=True)
-            with r_col3:
-                trend_color = "#00c853"
-                trend_data = [item['price'] * (1 - random.uniform(0, 0.05)) for _ in range(8)]
-                trend_data.append(item['price'])
-                st.markdown(f"<div style='margin-top:5px;'>{make_sparkline(trend_data, trend_color)}</div>", unsafe_allow_html=True)
-            with r_col4:
-                diff = abs(item['price'] * (item['chg']/100))
-                st.markdown(f"""
-                <div style="text-align: right; margin-top:2px;">
-                    <div class="wl-price">{format_price(item['price'])}</div>
-                    <div class="wl-chg" style="color:#00c853;">
-                        ↗ ({item['chg']:.2f}%)
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            st.markdown("<div style='margin-bottom: 2px; border-bottom: 1px solid rgba(255,255,255,0.03);'></div>", unsafe_allow_html=True)
+            entries = [(t, v) for t, v in MOVERS.get(board, []) if t in wl_by_ticker][:10]
+        else:
+            entries = [(i['ticker'], COIN_MAP.get(i['ticker'], {}).get(field)) for i in final_watchlist]
+            entries = [(t, v) for t, v in entries if v is not None and (v > 0 or not positive)]
+            entries.sort(key=lambda e: e[1], reverse=largest)
+        return [wl_by_ticker[t] for t, _ in entries], dict(entries)
+    
+    with tab_gainer:
+        horizon = st.radio("Horizon", list(MOVER_HORIZONS), index=1, horizontal=True, key="gainer_horizon", label_visibility="collapsed")
+        gainers, values = leaderboard(f"gainers_{horizon}", MOVER_HORIZONS[horizon], positive=True)
+        clicked = render_watchlist(gainers, wl_rows, "gainer_list", f"{filter_query}|{horizon}", "No data",
+                                   chg=values if horizon != '24h' else None)
+        if clicked:
+            set_ticker(clicked)
+            st.rerun()
     
     # Loser Tab
     with tab_loser:
-        items_with_chg_loser = [i for i in final_watchlist if i.get('chg') is not None]
-        losers = sorted(items_with_chg_loser, key=lambda x: x['chg'])
-        if not filter_query:
-            losers = losers[:10]
-            
-        if not losers:
-            st.info("No data available")
-        for item in losers:
-            coin_id = item.get('id', item['ticker'])
-            r_col1, r_col2, r_col3, r_col4 = st.columns([1.3, 3.5, 2.2, 4.5])
-            with r_col1:
-                st.markdown(f"""
-                    <div style="width:28px; height:28px; border-radius:50%; overflow:hidden; background:rgba(255,255,255,0.05); margin-top:5px; border: 1px solid var(--border-pink);">
-                        <img src="{item['logo']}" style="width:100%; height:100%; object-fit:contain;">
-                    </div>
-                """, unsafe_allow_html=True)
-            with r_col2:
-                st.markdown('<div class="ticker-btn-wrapper">', unsafe_allow_html=True)
-                if st.button(item['ticker'], key=f"btn_l_{coin_id}", use_container_width=True):
-                    set_ticker(item['ticker'])
-                st.markdown('</div>', unsafe_allow_html=True)
-                st.markdown(f"<div class='wl-name' style='margin-top:-15px; color:#ff80ab;'>{item['name']}</div>", unsafe_allow_html=True)
-            with r_col3:
-                is_up = item['chg'] >= 0
-                trend_color = "#00c853" if is_up else "#ff5252"
-                trend_data = [item['price'] * (1 + (random.uniform(0, 0.05) if not is_up else -random.uniform(0, 0.05))) for _ in range(8)]
-                trend_data.append(item['price'])
-                st.markdown(f"<div style='margin-top:5px;'>{make_sparkline(trend_data, trend_color)}</div>", unsafe_allow_html=True)
-            with r_col4:
-                is_up = item['chg'] >= 0
-                color = "#00c853" if is_up else "#ff5252"
-                arrow = "↗" if is_up else "↘"
-                diff = abs(item['price'] * (item['chg']/100))
-                st.markdown(f"""
-                <div style="text-align: right; margin-top:2px;">
-                    <div class="wl-price">{format_price(item['price'])}</div>
-                    <div class="wl-chg" style="color:{color};">
-                        {arrow} ({item['chg']:.2f}%)
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            st.markdown("<div style='margin-bottom: 2px; border-bottom: 1px solid rgba(255,255,255,0.03);'></div>", unsafe_allow_html=True)
-
+        horizon = st.radio("Horizon", list(MOVER_HORIZONS), index=1, horizontal=True, key="loser_horizon", label_visibility="collapsed")
+        losers, values = leaderboard(f"losers_{horizon}", MOVER_HORIZONS[horizon], largest=False)
+        clicked = render_watchlist(losers, wl_rows, "loser_list", f"{filter_query}|{horizon}", "No data available",
+                                   chg=values if horizon != '24h' else None)
+        if clicked:
+            set_ticker(clicked)
+            st.rerun()
+    
+    # Volume Tab: spikes vs. the archived median volume, and turnover (volume / market cap)
+    with tab_volume:
+        board = st.radio("Board", ["Spike", "Turnover"], horizontal=True, key="volume_board", label_visibility="collapsed")
+        if board == "Spike":
+            leaders = [wl_by_ticker[t] for t, _ in MOVERS.get('volume_spike', []) if t in wl_by_ticker]
+            empty_text = "Belum cukup riwayat volume."
+        else:
+            leaders = [wl_by_ticker[t] for t, _ in MOVERS.get('turnover', []) if t in wl_by_ticker]
+            empty_text = "No data"
+        if filter_query:
+            matches = {i['ticker'] for i in final_watchlist}
+            leaders = [i for i in leaders if i['ticker'] in matches]
+        else:
+            leaders = leaders[:10]
+        clicked = render_watchlist(leaders, wl_rows, "volume_list", f"{filter_query}|{board}", empty_text)
+        if clicked:
+            set_ticker(clicked)
+            st.rerun()
 
-        
+with st.sidebar:
+    render_sidebar()
 
 
 # --- UI COMPONENT: TICKER TAPE (REAL DATA) ---
 # Menggunakan 10 data teratas dari watchlist
-@st.cache_data(ttl=300)
+@observed_cache_data("ticker_tape", ttl=300)
 def render_ticker_tape(watchlist):
     items_html = ""
     for item in watchlist[:12]:
@@ -1559,135 +2964,86 @@ def render_ticker_tape(watchlist):
       {items_html}
     </div>
     </div>
-    <style>
-    .ticker-wrap {{
-      width: 100%;
-      overflow: hidden;
-      background-color: #15191e;
-      padding-left: 100%;
-      box-sizing: content-box;
-      border-bottom: 1px solid #2a2e39;
-      height: 30px;
-      line-height: 30px;
-      margin-bottom: 10px;
-    }}
-    .ticker {{
-      display: inline-block;
-      white-space: nowrap;
-      padding-right: 100%;
-      box-sizing: content-box;
-      animation-iteration-count: infinite;
-      animation-timing-function: linear;
-      animation-name: ticker;
-      animation-duration: 60s;
-    }}
-    .ticker__item {{
-      display: inline-block;
-      padding: 0 2rem;
-      font-size: 12px;
-      color: #d1d4dc;
-      font-weight: 600;
-    }}
-    .ticker__item .up {{ color: #00c853; }}
-    .ticker__item .down {{ color: #ff5252; }}
-    @keyframes ticker {{
-      0% {{ transform: translate3d(0, 0, 0); }}
-      100% {{ transform: translate3d(-100%, 0, 0); }}
-    }}
-    </style>
     """
 
-if 'watchlist_data_list' in st.session_state:
-    st.markdown(render_ticker_tape(st.session_state.watchlist_data_list), unsafe_allow_html=True)
-else:
-    # Fallback to static if no watchlist data yet
-    st.markdown("""<div class="ticker-wrap"><div class="ticker">
-      <div class="ticker__item">BTC <span class="up">95,400</span></div><div class="ticker__item">ETH <span class="up">3,300</span></div>
-    </div></div>""", unsafe_allow_html=True)
-
-
-# --- MAIN LAYOUT (Tabs: Chart, Financials, Profile) ---
-current_symbol = st.session_state.ticker_selector
-
-# --- CRYPTO GLOBAL DATA ---
-@st.cache_data(ttl=300)
-def get_global_crypto_data():
-    try:
-        res = requests.get("https://api.coingecko.com/api/v3/global")
-        return res.json()['data']
-    except:
-        return None
-
-global_data = get_global_crypto_data()
-btp_dominance = global_data['market_cap_percentage']['btc'] if global_data else 50.0
-
-logo_url = COIN_MAP.get(current_symbol, {}).get('image', '')
-
-if global_data:
-    mc_change = global_data['market_cap_change_percentage_24h_usd']
-    ihsg_p = f"${global_data['total_market_cap']['usd']/1e12:.2f}T"
-    ihsg_c = f"{mc_change:+.2f}%"
-    ihsg_pct = f"{btp_dominance:.1f}% BTC.D"
-    ihsg_color = "#00c853" if mc_change >= 0 else "#ff5252"
-    market_sentiment = "BULLISH" if mc_change >= 0 else "BEARISH"
-    sentiment_bg = "rgba(0, 200, 83, 0.1)" if mc_change >= 0 else "rgba(255, 82, 82, 0.1)"
-    sentiment_color = "#00c853" if mc_change >= 0 else "#ff5252"
-else:
-    ihsg_p = "$2.5T"
-    ihsg_c = "+1.2%"
-    ihsg_pct = "52% BTC.D"
-    ihsg_color = "#00c853"
-    market_sentiment = "NEUTRAL"
-    sentiment_bg = "rgba(255, 255, 255, 0.05)"
-    sentiment_color = "#848e9c"
-
-market_status_html = '<span style="background: rgba(0, 200, 83, 0.1); color: #00c853; padding: 5px 10px; border-radius: 4px; font-size: 10px; font-weight: 700; border: 1px solid rgba(0, 200, 83, 0.2); letter-spacing: 0.5px; margin-left: 8px;">24/7 MARKET</span>'
-
-header_html = f"""
-<div class="main-header" style="background: rgba(30, 34, 45, 0.7); backdrop-filter: blur(10px); -webkit-backdrop-filter: blur(10px); padding: 10px 20px; border-radius: 8px; border: 1px solid rgba(255, 255, 255, 0.05); display: flex; align-items: center; justify-content: space-between; margin-bottom: 10px; margin-top: -12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-    <div style="display: flex; align-items: center; gap: 12px;">
-        <img src="{logo_url}" onerror="this.style.display='none'" style="width: 36px; height: 36px; border-radius: 6px; object-fit: contain; background: rgba(255,255,255,0.05); padding: 4px;" alt="{current_symbol}">
-        <div style="display: flex; flex-direction: column; gap: 2px;">
-            <span style="font-size: 20px; font-weight: 800; color: #fff; letter-spacing: 0.5px; line-height: 1;">{current_symbol}</span>
-            <span style="font-size: 11px; color: #848e9c; font-weight: 500;">BINANCE | CRYPTO</span>
-        </div>
-        {market_status_html}
-    </div>
-    <div class="header-right" style="display: flex; align-items: center; gap: 20px;">
-        <!-- BACK TO LIST BUTTON -->
-        <a href="#card-{current_symbol}" class="mobile-hide" style="text-decoration: none; background: rgba(255, 255, 255, 0.05); color: #848e9c; padding: 8px 16px; border-radius: 4px; font-size: 11px; font-weight: 700; border: 1px solid rgba(255, 255, 255, 0.1); transition: all 0.2s; display: flex; align-items: center; gap: 6px;">
-            Kembali ke Daftar
-        </a>
-        <div style="text-align: right;">
-            <div style="font-size: 10px; color: #848e9c; font-weight: 600; text-transform: uppercase; margin-bottom: 2px;">Market Cap</div>
-            <div style="font-size: 15px; font-weight: 700; color: #fff;">{ihsg_p} <span style="color: {ihsg_color}; font-size: 11px; margin-left: 2px;">{ihsg_c}</span></div>
+@timed_fragment("header")
+def render_header(current_symbol):
+    """Ticker tape, universe status and the asset header (no widgets: other regions' reruns skip it)"""
+    if 'watchlist_data_list' in st.session_state:
+        st.markdown(render_ticker_tape(st.session_state.watchlist_data_list), unsafe_allow_html=True)
+    else:
+        # Fallback to static if no watchlist data yet
+        st.markdown("""<div class="ticker-wrap"><div class="ticker">
+          <div class="ticker__item">BTC <span class="up">95,400</span></div><div class="ticker__item">ETH <span class="up">3,300</span></div>
+        </div></div>""", unsafe_allow_html=True)
+
+    if UNIVERSE_STALE_SINCE is not None:
+        render_universe_refresh_status(UNIVERSE_STALE_SINCE)
+
+    # --- CRYPTO GLOBAL DATA ---
+    global_data = get_global_crypto_data()
+    btp_dominance = global_data['market_cap_percentage']['btc'] if global_data else 50.0
+
+    logo_url = COIN_MAP.get(current_symbol, {}).get('image', '')
+
+    if global_data:
+        mc_change = global_data['market_cap_change_percentage_24h_usd']
+        ihsg_p = f"${global_data['total_market_cap']['usd']/1e12:.2f}T"
+        ihsg_c = f"{mc_change:+.2f}%"
+        ihsg_pct = f"{btp_dominance:.1f}% BTC.D"
+        ihsg_color = "#00c853" if mc_change >= 0 else "#ff5252"
+        market_sentiment = "BULLISH" if mc_change >= 0 else "BEARISH"
+        sentiment_bg = "rgba(0, 200, 83, 0.1)" if mc_change >= 0 else "rgba(255, 82, 82, 0.1)"
+        sentiment_color = "#00c853" if mc_change >= 0 else "#ff5252"
+    else:
+        ihsg_p = "$2.5T"
+        ihsg_c = "+1.2%"
+        ihsg_pct = "52% BTC.D"
+        ihsg_color = "#00c853"
+        market_sentiment = "NEUTRAL"
+        sentiment_bg = "rgba(255, 255, 255, 0.05)"
+        sentiment_color = "#848e9c"
+
+    market_status_html = '<span style="background: rgba(0, 200, 83, 0.1); color: #00c853; padding: 5px 10px; border-radius: 4px; font-size: 10px; font-weight: 700; border: 1px solid rgba(0, 200, 83, 0.2); letter-spacing: 0.5px; margin-left: 8px;">24/7 MARKET</span>'
+
+    header_html = f"""
+    <div class="main-header" style="background: rgba(30, 34, 45, 0.7); backdrop-filter: blur(10px); -webkit-backdrop-filter: blur(10px); padding: 10px 20px; border-radius: 8px; border: 1px solid rgba(255, 255, 255, 0.05); display: flex; align-items: center; justify-content: space-between; margin-bottom: 10px; margin-top: -12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
+        <div style="display: flex; align-items: center; gap: 12px;">
+            <img src="{logo_url}" onerror="this.style.display='none'" style="width: 36px; height: 36px; border-radius: 6px; object-fit: contain; background: rgba(255,255,255,0.05); padding: 4px;" alt="{current_symbol}">
+            <div style="display: flex; flex-direction: column; gap: 2px;">
+                <span style="font-size: 20px; font-weight: 800; color: #fff; letter-spacing: 0.5px; line-height: 1;">{current_symbol}</span>
+                <span style="font-size: 11px; color: #848e9c; font-weight: 500;">BINANCE | CRYPTO</span>
+            </div>
+            {market_status_html}
         </div>
-        <div style="background: {sentiment_bg}; border: 1px solid {sentiment_color}44; padding: 6px 12px; border-radius: 4px; text-align: center;">
-            <div style="font-size: 9px; color: #848e9c; font-weight: 600; text-transform: uppercase;">Sentiment</div>
-            <div style="font-size: 11px; font-weight: 800; color: {sentiment_color};">{market_sentiment}</div>
+        <div class="header-right" style="display: flex; align-items: center; gap: 20px;">
+            <!-- BACK TO LIST BUTTON -->
+            <a href="#card-{current_symbol}" class="mobile-hide" style="text-decoration: none; background: rgba(255, 255, 255, 0.05); color: #848e9c; padding: 8px 16px; border-radius: 4px; font-size: 11px; font-weight: 700; border: 1px solid rgba(255, 255, 255, 0.1); transition: all 0.2s; display: flex; align-items: center; gap: 6px;">
+                Kembali ke Daftar
+            </a>
+            <div style="text-align: right;">
+                <div style="font-size: 10px; color: #848e9c; font-weight: 600; text-transform: uppercase; margin-bottom: 2px;">Market Cap</div>
+                <div style="font-size: 15px; font-weight: 700; color: #fff;">{ihsg_p} <span style="color: {ihsg_color}; font-size: 11px; margin-left: 2px;">{ihsg_c}</span></div>
+            </div>
+            <div style="background: {sentiment_bg}; border: 1px solid {sentiment_color}44; padding: 6px 12px; border-radius: 4px; text-align: center;">
+                <div style="font-size: 9px; color: #848e9c; font-weight: 600; text-transform: uppercase;">Sentiment</div>
+                <div style="font-size: 11px; font-weight: 800; color: {sentiment_color};">{market_sentiment}</div>
+            </div>
         </div>
     </div>
-</div>
-"""
-
-st.markdown(header_html, unsafe_allow_html=True)
-
+    """
 
-# Main Content Tabs - PERSISTENT
-main_tabs_options = ["Chart", "Asset Stats", "Professional Analyst Advisor"]
-if 'main_active_tab' not in st.session_state or st.session_state.main_active_tab not in main_tabs_options:
-    st.session_state.main_active_tab = "Chart"
+    st.markdown(header_html, unsafe_allow_html=True)
 
-main_active_tab = st.radio(
-    "Main Content Tabs",
-    main_tabs_options,
-    horizontal=True,
-    key="main_active_tab",
-    label_visibility="collapsed"
-)
+# --- MAIN LAYOUT (Tabs: Chart, Financials, Profile) ---
+current_symbol = st.session_state.ticker_selector
+render_header(current_symbol)
 
 
-if main_active_tab == "Chart":
+# --- PAGE REGIONS (fragments) ---
+@timed_fragment("chart")
+def render_chart_panel(current_symbol):
+    """TradingView chart, profile and order book of the selected asset"""
     # Layout: Chart on Left, Order Book on Right
     c_chart, c_orderbook = st.columns([3, 1])
 
@@ -1699,6 +3055,8 @@ if main_active_tab == "Chart":
         }
         if 'chart_timeframe' not in st.session_state: st.session_state.chart_timeframe = "Daily"
         
+        # Timeframe switch reruns only this panel
+        st.radio("Timeframe", list(timeframe_map), horizontal=True, key="chart_timeframe", label_visibility="collapsed")
         current_tf_code = timeframe_map[st.session_state.chart_timeframe]
         
         # --- TRADINGVIEW SYMBOL MAPPING (Fix for 1000-prefix coins) ---
@@ -1894,205 +3252,108 @@ if main_active_tab == "Chart":
 </div>
 """, unsafe_allow_html=True)
 
+@timed_fragment("screener")
+def render_screener_panel():
+    """Screener controls, scan status and results - result filters and chart clicks rerun only this block"""
     # --- MARKET SCREENER & AI ANALYSIS ---
     st.markdown('<div id="scanner-results"></div>', unsafe_allow_html=True)
     st.write("")
     st.markdown("### Market Screener & AI Analysis")
 
     # Control Bar
+    screener = get_screener_worker()
+    if 'screener_session' not in st.session_state:
+        st.session_state.screener_session = os.urandom(8).hex()  # Identifies this session's scan requests
     b1, b2, b3 = st.columns([2, 1, 6])
     with b1:
         if st.button("RUN SCREENER", key="run_scr_main", use_container_width=True, type="primary"):
-            st.session_state.run_screener = True
+            # Background job tied to this session (attaches to the in-flight scan if one is running)
+            st.session_state.screener_job = screener.request_refresh(st.session_state.screener_session)
     with b2:
         if st.button("Clear", key="clear_scr_main", use_container_width=True):
             st.session_state.scan_results = None
             st.session_state.last_update = None
-            clear_cached_results()  # Clear cache file
-            st.cache_data.clear()   # PURGE STREAMLIT DATA CACHE (News, etc.)
+            st.session_state.scan_changes = []
+            st.session_state.scan_stats = None
+            st.session_state.scan_version = screener.version  # Stay cleared until the next publish
+            invalidate_cache("screener_results")  # Universe, news and analysis survive
             st.rerun()
 
     st.markdown("---")
 
     # --- SCANNER LOGIC ---
-    # Load from cache if available (check 5-min expiration)
-    if 'scan_results' not in st.session_state:
-        cached_data = load_cached_results()
-        if cached_data:
-            st.session_state.scan_results = cached_data['results']
-            st.session_state.last_update = cached_data['timestamp']
-        else:
-            st.session_state.scan_results = None
+    # Results come from the shared background worker; sessions just pick up the latest version
+    published = screener.snapshot()
+    if 'scan_version' not in st.session_state:
+        st.session_state.scan_version = 0
+    if published['version'] > st.session_state.scan_version:
+        st.session_state.scan_results = published['results']
+        st.session_state.last_update = published['timestamp']
+        st.session_state.scan_version = published['version']
+        st.session_state.scan_changes = published['events']
+        st.session_state.scan_stats = published['stats']
+    elif 'scan_results' not in st.session_state:
+        st.session_state.scan_results = None
     
     # If results are showing, update heartbeat to prevent expiration while using
     if st.session_state.scan_results is not None:
         update_cache_heartbeat()
 
-    # Logic triggered by Sidebar Button or Local Button
-    if st.session_state.get('run_screener', False):
-        st.session_state.run_screener = False # Reset trigger
-        
-        # Show Full Screen Overlay
-        loading_placeholder = st.empty()
-        loading_placeholder.markdown(custom_loading_overlay("LOADING..."), unsafe_allow_html=True)
-        
-        # Artificial delay for cool effect (Game feel)
-        time.sleep(1.5)
-        
-        try:
-            loading_placeholder.markdown(custom_loading_overlay("LOADING..."), unsafe_allow_html=True)
-            
-            # PHASE 1: Tier 1 Filtering (Technical Filter using CoinGecko Data)
-            promising_tickers = []
-            results = [] 
-            
-            p_bar = st.progress(0, text="Menganalisis crypto potensial...")
-            
-            # Use already fetched CRYPTO_DATA for fast scanning
-            for i, coin in enumerate(CRYPTO_DATA):
-                # Update overlay progress
-                prog_pct = int((i + 1) / len(CRYPTO_DATA) * 100)
-                if i % 10 == 0 or i == len(CRYPTO_DATA) - 1:
-                    loading_placeholder.markdown(custom_loading_overlay(f"ANALYZING... ({coin['symbol'].upper()})", progress=prog_pct), unsafe_allow_html=True)
-                
-            # PHASE 1: Tier 1 Filtering (Smart Screening)
-            promising_tickers = []
-            
-            p_bar = st.progress(0, text="Menganalisis crypto potensial...")
-            
-            # Use already fetched CRYPTO_DATA and apply 5-Pillar filtering
-            for i, coin in enumerate(CRYPTO_DATA):
-                # Update overlay progress
-                prog_pct = int((i + 1) / len(CRYPTO_DATA) * 100)
-                if i % 15 == 0 or i == len(CRYPTO_DATA) - 1:
-                    loading_placeholder.markdown(custom_loading_overlay(f"ANALYZING... ({coin['symbol'].upper()})", progress=prog_pct), unsafe_allow_html=True)
-                
-                # 5-Pillar Screening Logic for Tier 1:
-                price_chg = abs(coin.get('price_change_percentage_24h', 0) or 0)
-                vol_mcap_ratio = coin.get('total_volume', 0) / (coin.get('market_cap', 1) or 1)
-                ath_chg = abs(coin.get('ath_change_percentage', 0) or 0)
-                
-                # Filter: Top 30 assets OR High Vol (>2.5%) OR Undervalued gem (>70% drop) OR High Activity (Vol/MCap > 0.08)
-                if i < 30 or price_chg > 2.5 or (ath_chg > 70 and vol_mcap_ratio > 0.05) or vol_mcap_ratio > 0.12:
-                    promising_tickers.append(coin['symbol'].upper())
-                
-                p_bar.progress((i + 1) / len(CRYPTO_DATA))
-            
-
-            
-            p_bar.empty()
-            
-            # Deep Dive
-            if promising_tickers:
-                total_assets = len(promising_tickers)
-                st.info(f"Menemukan {total_assets} asset potensial. Melakukan Deep Analysis...")
-                final_results = []
-                
-                with ThreadPoolExecutor(max_workers=25) as executor:
-                    futures = {executor.submit(analyze_crypto, t): t for t in promising_tickers}
-                    
-                    p_bar_deep = st.progress(0)
-                    for idx, future in enumerate(futures):
-                        res = future.result()
-                        if res:
-                            final_results.append(res)
-                        
-                        prog_deep = int((idx + 1) / len(promising_tickers) * 100)
-                        loading_placeholder.markdown(custom_loading_overlay(f"DEEP ANALYSIS {idx+1}/{len(promising_tickers)}", progress=prog_deep), unsafe_allow_html=True)
-                        p_bar_deep.progress((idx + 1) / len(promising_tickers))
-                    p_bar_deep.empty()
-                results = final_results
-            
-            if results:
-                st.session_state.scan_results = pd.DataFrame(results)
-                st.session_state.last_update = time.strftime("%H:%M")
-                
+    # Session's screener job: poll while running, report once when its run has finished
+    job_target = st.session_state.get('screener_job')
+    if st.session_state.pop('screener_detached', False):
+        st.info("Scan tetap berjalan di latar belakang untuk pengguna lain. Menampilkan hasil sebelumnya.")
+    if job_target is not None:
+        if screener.runs < job_target:
+            render_screener_job_status(job_target)
+        else:
+            st.session_state.screener_job = None
+            if screener.last_error:
+                st.error(f"Scanner Error: {screener.last_error}")
+            elif st.session_state.scan_results is not None:
                 # Filter logic
                 final_df = st.session_state.scan_results
                 high_quality_count = len(final_df[final_df['Status'] != 'HOLD'])
                 
-                # Save to cache
-                save_cached_results(st.session_state.scan_results, st.session_state.last_update)
-                
-                st.success(f"Scan Completed. Found {high_quality_count} High-Potential assets.")
+                scan_stats = st.session_state.get('scan_stats') or {}
+                if not scan_stats.get('partial'):
+                    st.success(f"Scan Completed. Found {high_quality_count} High-Potential assets.")
+                if scan_stats:
+                    st.caption(f"Deep Analysis candidates: {scan_stats['candidates']} ({scan_stats['selection']}). Re-analyzed {scan_stats['analyzed']} changed assets, reused {scan_stats['reused']} unchanged. Skipped {scan_stats['excluded']} stablecoin/wrapped assets.")
             else:
                 st.warning("No data fetched or no match found.")
-                st.session_state.scan_results = None
-
-        except Exception as e:
-            st.error(f"Scanner Error: {str(e)}")
-            
-        finally:
-            # Clear overlay
-            loading_placeholder.empty()
 
     # Display Logic
     if st.session_state.scan_results is not None:
         df = st.session_state.scan_results
+        scan_changes = st.session_state.get('scan_changes') or []
+        scan_stats = st.session_state.get('scan_stats') or {}
         
-        # Call the Fragmented Analysis View (Charts + Interactive Filters + Result Grid)
-        render_market_analysis(df)
-        
-elif main_active_tab == "Asset Stats":
-    st.markdown("## Statistik Asset")
-    st.markdown("---")
-    
-    try:
-        coin = COIN_MAP.get(current_symbol)
-        if not coin:
-            st.warning("Data statistik tidak tersedia untuk asset ini.")
-        else:
-            # Asset Info Header
-            col_info1, col_info2 = st.columns([2, 1])
-            with col_info1:
-                st.markdown(f"### {coin['name']} ({coin['symbol'].upper()})")
-                st.caption(f"**Market Cap Rank:** #{coin.get('market_cap_rank', 'N/A')}")
-            with col_info2:
-                market_cap = coin.get('market_cap', 0)
-                st.metric("Market Cap", f"${market_cap/1e9:.2f}B")
-            
-            st.markdown("---")
-            
-            # Key Metrics
-            st.markdown("### Market Statistics")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Price", f"${coin['current_price']:,}", f"{coin['price_change_percentage_24h']:+.2f}%")
-            with col2:
-                st.metric("24h High", f"${coin.get('high_24h', 0):,}")
-            with col3:
-                st.metric("24h Low", f"${coin.get('low_24h', 0):,}")
-            with col4:
-                st.metric("All Time High", f"${coin.get('ath', 0):,}")
-            
-            st.markdown("---")
-            
-            # Supply Info
-            st.markdown("### Supply Information")
-            s_col1, s_col2, s_col3 = st.columns(3)
-            with s_col1:
-                st.metric("Circulating Supply", f"{coin.get('circulating_supply', 0):,.0f}")
-            with s_col2:
-                st.metric("Total Supply", f"{coin.get('total_supply', 0) or 0:,.0f}")
-            with s_col3:
-                st.metric("Max Supply", f"{coin.get('max_supply', 0) or 0:,.0f}")
+        if scan_stats.get('partial'):
+            st.warning(
+                f"HASIL PARSIAL ({scan_stats['stop_reason']}): {scan_stats['coverage']:.0%} kandidat ter-skor "
+                f"({scan_stats['reused'] + scan_stats['analyzed']}/{scan_stats['candidates']}). "
+                "Jalankan ulang screener untuk melengkapi."
+            )
         
-            # Optional: Add technical indicators here if needed
+        # Status transitions since the previous scan (ENTRY / EXIT / STATUS_CHANGE)
+        if scan_changes:
+            with st.expander(f"Perubahan Sejak Scan Sebelumnya ({len(scan_changes)})"):
+                for event in scan_changes[:50]:
+                    if event['type'] == 'ENTRY':
+                        st.markdown(f"**{event['ticker']}** masuk: `{event['to']}`")
+                    elif event['type'] == 'EXIT':
+                        st.markdown(f"**{event['ticker']}** keluar (sebelumnya `{event['from']}`)")
+                    else:
+                        st.markdown(f"**{event['ticker']}**: `{event['from']}` → `{event['to']}`")
         
-            # Description
-            st.markdown("---")
-            st.markdown("### Asset Description")
-            description = coin.get('description', {}).get('en', 'Tidak ada deskripsi tersedia.')
-            if len(description) > 500:
-                st.write(description[:500] + "...")
-            else:
-                st.write(description)
-                
-    except Exception as e:
-        st.error(f"Gagal memuat statistik asset: {str(e)}")
+        # Call the Fragmented Analysis View (Charts + Interactive Filters + Result Grid)
+        render_market_analysis(df, status_changes={e['ticker']: e for e in scan_changes},
+                               results_key=st.session_state.get('scan_version'))
 
-elif main_active_tab == "Professional Analyst Advisor":
+@timed_fragment("advisor")
+def render_advisor():
+    """Question box, answer and forecast chart of the advisor tab"""
     st.markdown(f"## Penasehat Analis Professional")
     st.caption("Tanyakan apapun tentang crypto dan dapatkan penjelasan berdasarkan analisis teknikal & market buzz.")
     st.markdown("---")
@@ -2102,7 +3363,7 @@ elif main_active_tab == "Professional Analyst Advisor":
         st.session_state.advisor_chat_history = []
     
     # Query Input - Compact Layout
-    q_col1, q_col2 = st.columns([4, 1])
+    q_col1, q_col2, q_col3 = st.columns([3, 1, 1])
     with q_col1:
         query = st.text_input(
             "Cari Kode Crypto (contoh: BTC, ETH)", 
@@ -2112,8 +3373,10 @@ elif main_active_tab == "Professional Analyst Advisor":
         )
     with q_col2:
         ask_btn = st.button("Tanya Analis", use_container_width=True, type="primary")
+    with q_col3:
+        refresh_btn = st.button("↻ Berita", use_container_width=True, help="Ambil ulang berita ticker ini, lalu analisis ulang")
     
-    if ask_btn and query:
+    if (ask_btn or refresh_btn) and query:
         ticker_query = query.upper().strip()
         
         # Map IHSG query
@@ -2127,9 +3390,15 @@ elif main_active_tab == "Professional Analyst Advisor":
             is_ticker_query = True
             
         if is_ticker_query:
+            if refresh_btn:
+                invalidate_cache("news", [ticker_query])  # Its analysis goes with it
             # Ticker-specific analysis
             with st.spinner(f"Menganalisis {ticker_query}..."):
-                data = analyze_crypto(ticker_query)
+                try:
+                    advisor_technicals = get_technicals((ticker_query,))
+                except Exception:
+                    advisor_technicals = {}
+                data = cached_analyze_crypto(ticker_query, technicals=advisor_technicals)
                 
                 if data:
                     # Store in chat history
@@ -2146,9 +3415,13 @@ elif main_active_tab == "Professional Analyst Advisor":
                     current_price = data['Price']
                     price_change_1d = data['Change %']
                     
-                    # Placeholder for technicals
-                    current_rsi = 65 if "BULLISH" in data['Status'] else (35 if "BEARISH" in data['Status'] else 50)
-                    volume_ratio = 1.5 if "VOLUME" in data['Status'] else 1.0
+                    # Real daily-bar technicals when available, status-based estimate otherwise
+                    current_rsi = data.get('RSI')
+                    if current_rsi is None:
+                        current_rsi = 65 if "BULLISH" in data['Status'] else (35 if "BEARISH" in data['Status'] else 50)
+                    volume_ratio = data.get('Volume Ratio')
+                    if volume_ratio is None:
+                        volume_ratio = 1.5 if "VOLUME" in data['Status'] else 1.0
                     
                     # Recommendation Logic
                     status = data['Status']
@@ -2491,3 +3764,104 @@ Silakan tanyakan lagi dengan topik yang lebih spesifik!
     )
 
 
+# Main Content Tabs - PERSISTENT
+main_tabs_options = ["Chart", "Asset Stats", "Professional Analyst Advisor"]
+if 'main_active_tab' not in st.session_state or st.session_state.main_active_tab not in main_tabs_options:
+    st.session_state.main_active_tab = "Chart"
+
+main_active_tab = st.radio(
+    "Main Content Tabs",
+    main_tabs_options,
+    horizontal=True,
+    key="main_active_tab",
+    label_visibility="collapsed"
+)
+
+
+if main_active_tab == "Chart":
+    render_chart_panel(current_symbol)
+    render_screener_panel()
+
+elif main_active_tab == "Asset Stats":
+    st.markdown("## Statistik Asset")
+    st.markdown("---")
+    
+    try:
+        coin = COIN_MAP.get(current_symbol)
+        if not coin:
+            st.warning("Data statistik tidak tersedia untuk asset ini.")
+        else:
+            # Asset Info Header
+            col_info1, col_info2 = st.columns([2, 1])
+            with col_info1:
+                st.markdown(f"### {coin['name']} ({coin['symbol'].upper()})")
+                st.caption(f"**Market Cap Rank:** #{coin.get('market_cap_rank', 'N/A')}")
+            with col_info2:
+                market_cap = coin.get('market_cap', 0)
+                st.metric("Market Cap", f"${market_cap/1e9:.2f}B")
+            
+            st.markdown("---")
+            
+            # Key Metrics
+            st.markdown("### Market Statistics")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Price", f"${coin['current_price']:,}", f"{coin['price_change_percentage_24h']:+.2f}%")
+            with col2:
+                st.metric("24h High", f"${coin.get('high_24h', 0):,}")
+            with col3:
+                st.metric("24h Low", f"${coin.get('low_24h', 0):,}")
+            with col4:
+                st.metric("All Time High", f"${coin.get('ath', 0):,}")
+            
+            st.markdown("---")
+            
+            # Supply Info
+            st.markdown("### Supply Information")
+            s_col1, s_col2, s_col3 = st.columns(3)
+            with s_col1:
+                st.metric("Circulating Supply", f"{coin.get('circulating_supply', 0):,.0f}")
+            with s_col2:
+                st.metric("Total Supply", f"{coin.get('total_supply', 0) or 0:,.0f}")
+            with s_col3:
+                st.metric("Max Supply", f"{coin.get('max_supply', 0) or 0:,.0f}")
+        
+            # Optional: Add technical indicators here if needed
+        
+            # Description
+            st.markdown("---")
+            st.markdown("### Asset Description")
+            description = coin.get('description', {}).get('en', 'Tidak ada deskripsi tersedia.')
+            if len(description) > 500:
+                st.write(description[:500] + "...")
+            else:
+                st.write(description)
+                
+    except Exception as e:
+        st.error(f"Gagal memuat statistik asset: {str(e)}")
+
+elif main_active_tab == "Professional Analyst Advisor":
+    render_advisor()
+
+
+get_render_timings().record("page", time.perf_counter() - PAGE_RUN_STARTED)
+
+# --- CACHE DIAGNOSTICS (hidden: open the app with ?diag=1) ---
+if st.query_params.get("diag") == "1":
+    st.markdown("---")
+    with st.expander("Cache Diagnostics", expanded=True):
+        metrics = get_cache_metrics()
+        st.dataframe(metrics.snapshot(), use_container_width=True, hide_index=True)
+        tiers = pd.DataFrame([
+            dict(get_tiered_cache(name, mb).stats(), cache=name)
+            for name, mb in (("sentiment", SENTIMENT_CACHE_MB), ("analysis", ANALYSIS_CACHE_MB))
+        ]).set_index('cache')
+        st.caption("Per-ticker caches (memory LRU + disk)")
+        st.dataframe(tiers, use_container_width=True)
+        st.caption("Render time per region - 'page' is a full rerun, the others are what an interaction inside them costs")
+        st.dataframe(get_render_timings().snapshot(), use_container_width=True, hide_index=True)
+        st.download_button(
+            "Export metrics", data=metrics.export_text() + get_render_timings().export_text(), file_name="mitulama_cache_metrics.txt",
+            mime="text/plain", key="export_cache_metrics"
+        )